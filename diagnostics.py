@@ -0,0 +1,57 @@
+"""Diagnostics -- live timings and cache hit rates for the data layer."""
+
+import streamlit as st
+
+from utils import instrumentation
+from utils.theme import metric_card_css, page_header
+
+REFRESH_SECONDS = 5
+
+st.set_page_config(page_title="DBC - Diagnostics", page_icon="🩺", layout="wide")
+st.markdown(metric_card_css(), unsafe_allow_html=True)
+st.markdown(page_header("Diagnostics", "Where the dashboard spends its time"), unsafe_allow_html=True)
+
+if not instrumentation.ENABLED:
+    st.info("Diagnostics are off. Start the app with `DBC_DIAGNOSTICS=1` to record timings.")
+    st.stop()
+
+col_live, col_reset = st.columns([3, 1])
+live = col_live.toggle(f"Auto-refresh every {REFRESH_SECONDS} s", value=False)
+if col_reset.button("Reset counters"):
+    instrumentation.reset()
+
+
+def render():
+    report = instrumentation.report()
+    functions, caches, pages = report["functions"], report["caches"], report["pages"]
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Instrumented Calls", f"{int(functions['Calls'].sum()) if len(functions) else 0:,}")
+    c2.metric("Time in Data Layer", f"{pages['Data Time (ms)'].sum() / 1000 if len(pages) else 0:.2f} s")
+    lookups = caches["Hits"].sum() + caches["Misses"].sum()
+    c3.metric("Overall Cache Hit Rate", f"{caches['Hits'].sum() / lookups:.0%}" if lookups else "-")
+
+    st.subheader("Pages")
+    st.caption("Time spent in data and analytics calls while rendering each page (outermost calls only).")
+    if len(pages):
+        st.dataframe(pages, hide_index=True, use_container_width=True)
+    else:
+        st.write("No page runs recorded yet.")
+
+    st.subheader("Caches")
+    st.dataframe(caches.style.format({"Hit Rate": "{:.0%}"}, na_rep="-"), hide_index=True, use_container_width=True)
+
+    st.subheader("Functions")
+    if len(functions):
+        st.dataframe(
+            functions.style.format({
+                "Total (ms)": "{:.1f}", "Mean (ms)": "{:.2f}", "p95 (ms)": "{:.2f}",
+                "Last Rows": "{:,.0f}", "Last Size (KB)": "{:,.1f}",
+            }, na_rep="-"),
+            hide_index=True, use_container_width=True,
+        )
+    else:
+        st.write("No calls recorded yet.")
+
+
+st.fragment(run_every=REFRESH_SECONDS if live else None)(render)()
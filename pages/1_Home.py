@@ -11,12 +11,13 @@ from utils.data_loader import (
     get_book_summary,
     get_enriched_books,
     get_book_enrichment,
-    MEMBERS,
+    get_members,
 )
 from utils.theme import COLORS, metric_card_css, page_header, stat_card
-from utils import charts
+from utils import charts, instrumentation
 
 st.set_page_config(page_title="DBC - Home", page_icon="🍷", layout="wide")
+instrumentation.page("Home")
 
 # -- Header ------------------------------------------------------------------
 st.markdown(page_header("Drunk Book Club", "Dashboard home — a data-driven look at our reading journey"), unsafe_allow_html=True)
@@ -30,7 +31,7 @@ enrichment = get_enriched_books()
 st.markdown(metric_card_css(), unsafe_allow_html=True)
 
 total_books = len(raw)
-active_members = len(MEMBERS)
+active_members = len(get_members())
 first_date = raw["Date"].min()
 last_date = raw["Date"].max()
 months_active = max(1, (last_date.year - first_date.year) * 12 + last_date.month - first_date.month)
@@ -157,12 +158,16 @@ fun_facts = [
     f"Josh has proposed the most books — a true literary engine.",
     f"The club averages **{total_books / max(1, months_active / 12):.1f} books per year**.",
     f"Prophet Song and The Safekeep both cracked a **4.0+** rating — elite company.",
-    f"Ghost Fleet scored a dismal **{summary[summary['Book'] == 'Ghost Fleet']['avg_like'].values[0]:.2f}** — the DBC basement dweller.",
     f"The first book ever discussed was **{raw.sort_values('Date').iloc[0]['Book']}** back in **{raw.sort_values('Date').iloc[0]['Date'].strftime('%B %Y')}**.",
-    f"Freedom achieved a remarkable **{summary[summary['Book'] == 'Freedom']['avg_like'].values[0]:.2f}** average rating.",
     f"The club has **{active_members} active members** contributing their hot takes.",
     f"Project Hail Mary ratings ranged wildly — Ryan gave it a **-0.5** (yes, negative).",
 ]
+# Facts about specific books only apply when those books are in the sheet
+book_avgs = summary.set_index("Book")["avg_like"]
+if "Ghost Fleet" in book_avgs:
+    fun_facts.append(f"Ghost Fleet scored a dismal **{book_avgs['Ghost Fleet']:.2f}** — the DBC basement dweller.")
+if "Freedom" in book_avgs:
+    fun_facts.append(f"Freedom achieved a remarkable **{book_avgs['Freedom']:.2f}** average rating.")
 
 fact = random.choice(fun_facts)
 st.markdown(
@@ -5,12 +5,14 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from utils.calculations import top_k_similar
 from utils.charts import radar_chart, scatter_plot
 from utils.data_loader import (
     get_all_books,
     get_book_enrichment,
+    get_book_ratings,
     get_book_summary,
-    get_ratings_long,
+    get_members,
     load_raw_data,
 )
 from utils.theme import (
@@ -20,10 +22,12 @@ from utils.theme import (
     metric_card_css,
     page_header,
 )
+from utils import instrumentation
 
 # ---------------------------------------------------------------------------
 # Page config
 # ---------------------------------------------------------------------------
+instrumentation.page("Book Explorer")
 st.markdown(metric_card_css(), unsafe_allow_html=True)
 st.markdown(page_header("Book Explorer", "Deep-dive into any book the club has read"), unsafe_allow_html=True)
 
@@ -39,8 +43,7 @@ selected_book = st.selectbox("Choose a book", all_books, index=len(all_books) -
 raw = load_raw_data()
 book_row = raw[raw["Book"] == selected_book].iloc[0]
 enrichment = get_book_enrichment(selected_book)
-ratings = get_ratings_long()
-book_ratings = ratings[ratings["Book"] == selected_book]
+book_ratings = get_book_ratings(selected_book)
 summary = get_book_summary()
 book_summary = summary[summary["Book"] == selected_book]
 
@@ -151,7 +154,7 @@ if not book_summary.empty:
 
     # Attendance rate scaled to 0-5
     num_raters = bs["num_raters"]
-    total_members = len(MEMBER_COLORS)
+    total_members = len(get_members())
     attendance_scaled = (num_raters / total_members) * 5
 
     # Agreement: inverse of std_like, scaled 0-5 (lower std = higher agreement)
@@ -225,6 +228,22 @@ if not summary.empty:
     apply_plotly_theme(fig)
     st.plotly_chart(fig, use_container_width=True)
 
+# ---------------------------------------------------------------------------
+# If You Liked This -- nearest books by rating pattern
+# ---------------------------------------------------------------------------
+similar = top_k_similar(selected_book, k=5)
+if not similar.empty:
+    st.markdown(f'<h3 style="color:{COLORS["secondary"]};font-family:Georgia,serif;">If You Liked This...</h3>', unsafe_allow_html=True)
+    st.caption("Books the club rated most similarly (cosine similarity of member ratings).")
+    for _, row in similar.iterrows():
+        st.markdown(
+            f'<div style="background:{COLORS["bg_card"]};border-left:4px solid {COLORS["success"]};'
+            f'border-radius:8px;padding:10px 16px;margin-bottom:6px;display:flex;justify-content:space-between;">'
+            f'<span style="color:{COLORS["text"]};">{row["Book"]}</span>'
+            f'<span style="color:{COLORS["secondary"]};font-family:Georgia,serif;">{row["Similarity"]:.3f}</span></div>',
+            unsafe_allow_html=True,
+        )
+
 # ---------------------------------------------------------------------------
 # Fun Facts & Awards (from enrichment)
 # ---------------------------------------------------------------------------
@@ -6,17 +6,18 @@ import numpy as np
 import plotly.graph_objects as go
 
 from utils.data_loader import (
-    MEMBERS,
-    get_ratings_long,
+    get_members,
+    get_member_ratings,
     get_book_summary,
     load_raw_data,
-    get_enriched_books,
 )
 from utils.calculations import (
     member_stats,
     agreement_score,
     pairwise_correlation,
     member_deviation_per_book,
+    member_genre_diversity,
+    prediction_vs_actual,
 )
 from utils.charts import (
     radar_chart,
@@ -31,10 +32,12 @@ from utils.theme import (
     metric_card_css,
     stat_card,
 )
+from utils import instrumentation
 
 # ---------------------------------------------------------------------------
 # Page config
 # ---------------------------------------------------------------------------
+instrumentation.page("Member Profiles")
 st.markdown(page_header("Member Profiles", "Deep-dive into individual reading tastes"), unsafe_allow_html=True)
 st.markdown(metric_card_css(), unsafe_allow_html=True)
 
@@ -42,11 +45,9 @@ st.markdown(metric_card_css(), unsafe_allow_html=True)
 # Data
 # ---------------------------------------------------------------------------
 raw = load_raw_data()
-ratings = get_ratings_long()
 summary = get_book_summary()
-stats = member_stats()
 agree = agreement_score()
-enrichment = get_enriched_books()
+members = get_members()
 
 # ---------------------------------------------------------------------------
 # Mode toggle & member selector
@@ -56,14 +57,30 @@ compare_mode = st.toggle("Compare Mode")
 if compare_mode:
     col_sel1, col_sel2 = st.columns(2)
     with col_sel1:
-        member_a = st.selectbox("Member A", MEMBERS, index=0)
+        member_a = st.selectbox("Member A", members, index=0)
     with col_sel2:
-        member_b = st.selectbox("Member B", MEMBERS, index=1)
+        member_b = st.selectbox("Member B", members, index=1)
     selected_members = [member_a, member_b]
 else:
-    member_a = st.selectbox("Select Member", MEMBERS, index=0)
+    member_a = st.selectbox("Select Member", members, index=0)
     selected_members = [member_a]
 
+# Stats window: the member cards and taste radar cover books discussed in this range
+meeting_dates = sorted(summary["Date"].unique())
+if len(meeting_dates) > 1:
+    window_start, window_end = st.select_slider(
+        "Stats window",
+        options=meeting_dates,
+        value=(meeting_dates[0], meeting_dates[-1]),
+        format_func=lambda d: pd.Timestamp(d).strftime("%b %Y"),
+    )
+else:
+    window_start, window_end = meeting_dates[0], meeting_dates[-1]
+if (window_start, window_end) == (meeting_dates[0], meeting_dates[-1]):
+    stats = member_stats()
+else:
+    stats = member_stats(pd.Timestamp(window_start), pd.Timestamp(window_end))
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -75,14 +92,9 @@ def _member_color(name: str) -> str:
 
 def _genre_diversity(member: str) -> float:
     """Count distinct genres across books the member rated (0-5 scale)."""
-    member_books = ratings[ratings["Member"] == member]["Book"].unique()
-    genres = set()
-    for book in member_books:
-        info = enrichment.get(book, {})
-        for g in info.get("genres", []):
-            genres.add(g)
+    genres = member_genre_diversity().get(member, 0)
     # Scale: cap at 20 genres -> 5
-    return min(len(genres) / 4.0, 5.0)
+    return min(genres / 4.0, 5.0)
 
 
 def _taste_profile(member: str) -> list[float]:
@@ -129,7 +141,7 @@ def _member_card(member: str):
         return
     row = row.iloc[0]
     books_proposed = int(raw[raw["Proposer"] == member].shape[0])
-    first_book_date = ratings[ratings["Member"] == member]["Date"].min()
+    first_book_date = get_member_ratings(member)["Date"].min()
     first_str = first_book_date.strftime("%b %Y") if pd.notna(first_book_date) else "N/A"
 
     c1, c2, c3, c4 = st.columns(4)
@@ -141,9 +153,9 @@ def _member_card(member: str):
 
 def _rating_history_fig(members: list[str]):
     """Line chart of likeability over time with group avg."""
-    book_avgs = ratings.groupby(["Book", "Date"]).agg(
-        group_avg=("Likeability", "mean")
-    ).reset_index().sort_values("Date")
+    book_avgs = summary[["Book", "Date", "avg_like"]].rename(
+        columns={"avg_like": "group_avg"}
+    ).sort_values("Date")
 
     fig = go.Figure()
     # Group average dashed
@@ -154,7 +166,7 @@ def _rating_history_fig(members: list[str]):
         line=dict(color=COLORS["text_muted"], dash="dash", width=2),
     ))
     for m in members:
-        mr = ratings[ratings["Member"] == m].sort_values("Date")
+        mr = get_member_ratings(m).sort_values("Date")
         fig.add_trace(go.Scatter(
             x=mr["Date"], y=mr["Likeability"],
             mode="lines+markers",
@@ -172,6 +184,35 @@ def _rating_history_fig(members: list[str]):
     return fig
 
 
+def _prediction_fig(member: str, metric: str, predictions: pd.DataFrame):
+    """Actual vs model-predicted ratings for the books a member rated."""
+    rated = predictions[predictions["Rated"]]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[0, 5], y=[0, 5],
+        mode="lines",
+        name="Perfect prediction",
+        line=dict(color=COLORS["text_muted"], dash="dash", width=1),
+    ))
+    fig.add_trace(go.Scatter(
+        x=rated["Predicted"], y=rated["Actual"],
+        mode="markers",
+        name=member,
+        text=rated["Book"],
+        hovertemplate="%{text}<br>Predicted %{x:.2f}<br>Actual %{y:.1f}<extra></extra>",
+        marker=dict(size=10, color=_member_color(member)),
+    ))
+    fig.update_layout(
+        title=f"Predicted vs Actual {metric}",
+        xaxis_title="Predicted",
+        yaxis_title="Actual",
+        xaxis=dict(range=[0, 5.5]),
+        yaxis=dict(range=[0, 5.5]),
+    )
+    apply_plotly_theme(fig)
+    return fig
+
+
 def _deviation_fig(members: list[str]):
     """Bar chart of per-book deviation from group mean."""
     dev = member_deviation_per_book()
@@ -217,10 +258,10 @@ def _taste_alignment(member: str) -> pd.DataFrame:
 
 def _head_to_head_table(m1: str, m2: str) -> pd.DataFrame:
     """Table comparing two members on shared books."""
-    r1 = ratings[ratings["Member"] == m1][["Book", "Date", "Likeability"]].rename(
+    r1 = get_member_ratings(m1)[["Book", "Date", "Likeability"]].rename(
         columns={"Likeability": f"{m1} Rating"}
     )
-    r2 = ratings[ratings["Member"] == m2][["Book", "Likeability"]].rename(
+    r2 = get_member_ratings(m2)[["Book", "Likeability"]].rename(
         columns={"Likeability": f"{m2} Rating"}
     )
     merged = r1.merge(r2, on="Book").sort_values("Date")
@@ -267,10 +308,10 @@ if compare_mode:
     st.subheader("Rating Distribution")
     dc1, dc2 = st.columns(2)
     with dc1:
-        m_data = ratings[ratings["Member"] == member_a]
+        m_data = get_member_ratings(member_a)
         st.plotly_chart(histogram(m_data, "Likeability", title=f"{member_a}", nbins=10), use_container_width=True)
     with dc2:
-        m_data = ratings[ratings["Member"] == member_b]
+        m_data = get_member_ratings(member_b)
         st.plotly_chart(histogram(m_data, "Likeability", title=f"{member_b}", nbins=10), use_container_width=True)
 
     # Harsh or generous
@@ -328,7 +369,7 @@ else:
 
     # Rating distribution
     st.subheader("Rating Distribution")
-    m_data = ratings[ratings["Member"] == member_a]
+    m_data = get_member_ratings(member_a)
     st.plotly_chart(histogram(m_data, "Likeability", title=f"{member_a} — Likeability Scores", nbins=10), use_container_width=True)
 
     # Harsh or generous
@@ -365,3 +406,31 @@ else:
         st.info("Not enough shared books for correlation.")
     else:
         st.dataframe(alignment, use_container_width=True, hide_index=True)
+
+    # Predicted vs actual, from the club-wide rating model; members who have not
+    # rated anything yet have no row in it
+    if not prediction_vs_actual(member_a).empty:
+        st.subheader("Predicted vs Actual")
+        st.caption(
+            "One matrix-factorization model of every member's ratings predicts each member/book "
+            "cell. Points near the diagonal are books the model saw coming; the table lists "
+            "unread books by predicted rating."
+        )
+        pred_metric = st.radio("Metric", ["Likeability", "Importance"], horizontal=True, key="pred_metric")
+        predictions = prediction_vs_actual(member_a, pred_metric)
+        rated = predictions[predictions["Rated"]]
+        col_fig, col_unread = st.columns([3, 2])
+        with col_fig:
+            st.plotly_chart(_prediction_fig(member_a, pred_metric, predictions), use_container_width=True)
+            if not rated.empty:
+                rmse = float(np.sqrt((rated["Residual"] ** 2).mean()))
+                st.markdown(stat_card("Typical Miss (RMSE)", f"{rmse:.2f} pts"), unsafe_allow_html=True)
+        with col_unread:
+            unread = predictions[~predictions["Rated"]].sort_values("Predicted", ascending=False)
+            if unread.empty:
+                st.info(f"{member_a} has rated every book.")
+            else:
+                st.dataframe(
+                    unread[["Book", "Predicted"]].round(2),
+                    use_container_width=True, hide_index=True,
+                )
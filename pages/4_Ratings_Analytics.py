@@ -6,11 +6,12 @@ import streamlit as st
 from utils.data_loader import get_book_summary, get_member_book_matrix, get_ratings_long
 from utils.calculations import rating_trends, taste_similarity_matrix
 from utils.theme import COLORS, page_header, metric_card_css
-from utils import charts
+from utils import charts, instrumentation
 
 # ---------------------------------------------------------------------------
 # Page setup
 # ---------------------------------------------------------------------------
+instrumentation.page("Ratings Analytics")
 st.markdown(page_header("Ratings Analytics", subtitle="Statistical Deep-Dive"), unsafe_allow_html=True)
 st.markdown(metric_card_css(), unsafe_allow_html=True)
 
@@ -85,17 +86,36 @@ st.divider()
 # ---------------------------------------------------------------------------
 st.subheader("Rating Trends Over Time")
 
-use_rolling = st.toggle("3-book rolling average", value=False)
-trends = rating_trends()
+col_smooth, col_window = st.columns([2, 1])
+with col_smooth:
+    smoothing = st.radio(
+        "Smoothing", ["None", "Rolling", "Expanding", "Exponential"], horizontal=True,
+        help="Rolling: mean of the last N books. Expanding: mean of every book so far. "
+             "Exponential: recent books weigh more, with a span of N books.",
+    )
+with col_window:
+    window = st.slider(
+        "Window (books)", min_value=2, max_value=max(3, min(len(summary), 50)), value=3,
+        disabled=smoothing in ("None", "Expanding"),
+    )
 
-if use_rolling:
-    y_cols = ["rolling_like_3", "rolling_imp_3"]
-    names = ["Likeability (3-book avg)", "Importance (3-book avg)"]
-    dash_cols = []
+dash_cols = []
+if smoothing == "Rolling":
+    trends = rating_trends(window)
+    y_cols = [f"rolling_like_{window}", f"rolling_imp_{window}"]
+    names = [f"Likeability ({window}-book avg)", f"Importance ({window}-book avg)"]
+elif smoothing == "Expanding":
+    trends = rating_trends(kind="expanding")
+    y_cols = ["expanding_like", "expanding_imp"]
+    names = ["Likeability (running avg)", "Importance (running avg)"]
+elif smoothing == "Exponential":
+    trends = rating_trends(window, kind="ewm")
+    y_cols = ["ewm_like", "ewm_imp"]
+    names = [f"Likeability (EWM, span {window})", f"Importance (EWM, span {window})"]
 else:
+    trends = rating_trends()
     y_cols = ["avg_like", "avg_imp"]
     names = ["Avg Likeability", "Avg Importance"]
-    dash_cols = []
 
 fig_trends = charts.line_chart(
     trends, x="Date", y_cols=y_cols, names=names,
@@ -18,22 +18,26 @@ from utils.calculations import (
     book_controversy,
     contrarian_index,
     hivemind_index,
-    hot_takes,
+    hot_take_count,
     pairwise_correlation,
-    attendance_by_book,
+    top_hot_takes,
+    attendance_matrix,
 )
-from utils.data_loader import MEMBERS
-from utils import charts
+from utils.data_loader import get_members
+from utils import charts, instrumentation
 
 # ---------------------------------------------------------------------------
 # Page setup
 # ---------------------------------------------------------------------------
+instrumentation.page("Group Dynamics")
 st.markdown(metric_card_css(), unsafe_allow_html=True)
 st.markdown(
     page_header("Group Dynamics", "Agreement, Controversy & Hot Takes"),
     unsafe_allow_html=True,
 )
 
+members = get_members()
+
 # ===================================================================
 # 1. Consensus vs Controversy
 # ===================================================================
@@ -150,8 +154,21 @@ st.markdown("---")
 st.subheader("Hot Takes Wall")
 st.caption("The 10 biggest single-rating deviations from the group average.")
 
-takes = hot_takes(threshold=0.0)  # Get all, then take top 10
-takes_top = takes.head(10)
+biggest = top_hot_takes(1)
+max_deviation = float(math.ceil(biggest["abs_deviation"].iloc[0] * 10) / 10) if len(biggest) else 1.0
+col_threshold, col_member = st.columns([2, 1])
+with col_threshold:
+    threshold = st.slider(
+        "Minimum deviation from the group average",
+        min_value=0.0, max_value=max(max_deviation, 0.1), value=0.0, step=0.1,
+    )
+with col_member:
+    focus = st.selectbox("Whose hot takes", ["Everyone"] + list(members))
+
+takes_top = top_hot_takes(10, member=None if focus == "Everyone" else focus, threshold=threshold)
+st.markdown(f"**{hot_take_count(threshold)}** ratings sit more than {threshold:.1f} pts from their book's average.")
+if takes_top.empty:
+    st.info("No hot takes above this threshold.")
 
 for _, row in takes_top.iterrows():
     direction = "above" if row["deviation"] > 0 else "below"
@@ -188,12 +205,27 @@ st.markdown("---")
 st.subheader("Agreement Network")
 st.caption("Nodes = members, edges = rating correlation. Thicker lines mean more similar taste.")
 
-corr = pairwise_correlation()
+col_test, col_filter = st.columns([2, 1])
+with col_test:
+    test = st.radio(
+        "Significance test",
+        ["t test", "Permutation"],
+        horizontal=True,
+        help="Permutation p-values shuffle one member's ratings over the shared books, "
+             "with no normality assumption -- exact when a pair shares 7 books or fewer. "
+             "Slower: up to 10,000 shuffles, fewer for big clubs.",
+    )
+with col_filter:
+    significant_only = st.toggle("Only significant pairs (p < 0.05)", value=False)
+
+corr = pairwise_correlation("permutation" if test == "Permutation" else "t")
+if significant_only:
+    corr = corr[corr["P-value"] < 0.05]
 
 # Position nodes in a circle
-n = len(MEMBERS)
+n = len(members)
 nodes = []
-for i, member in enumerate(MEMBERS):
+for i, member in enumerate(members):
     angle = 2 * math.pi * i / n - math.pi / 2
     nodes.append({
         "name": member,
@@ -219,6 +251,11 @@ if not corr.empty:
     fig_network = charts.network_graph(nodes, edges, title="")
     fig_network.update_layout(height=550)
     st.plotly_chart(fig_network, use_container_width=True)
+
+    with st.expander("Pair correlations and p-values"):
+        st.dataframe(corr, use_container_width=True, hide_index=True)
+elif significant_only:
+    st.info("No member pair is significantly correlated at p < 0.05.")
 else:
     st.info("Not enough shared ratings to compute correlations.")
 
@@ -229,15 +266,11 @@ st.markdown("---")
 st.subheader("Attendance Patterns")
 st.caption("Who rated each book — showing participation across the club's history.")
 
-attendance = attendance_by_book()
-# Pivot: Book x Member with 1/0 for stacked bar
-att_pivot = attendance.pivot_table(index="Book", columns="Member", values="Rated", aggfunc="first")
-# Maintain book order
-book_order = attendance.drop_duplicates("Book")["Book"].tolist()
-att_pivot = att_pivot.loc[[b for b in book_order if b in att_pivot.index]]
+# Book x Member, in book order, with True/False for the stacked bar
+att_pivot = attendance_matrix()
 
 fig_attend = go.Figure()
-for member in MEMBERS:
+for member in members:
     if member in att_pivot.columns:
         fig_attend.add_trace(go.Bar(
             x=att_pivot.index,
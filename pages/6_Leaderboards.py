@@ -5,14 +5,18 @@ import streamlit as st
 from utils.data_loader import get_book_summary
 from utils.calculations import (
     book_controversy,
+    book_rank_intervals,
     member_stats,
     proposer_performance,
+    proposer_rank_intervals,
     agreement_score,
     contrarian_index,
 )
 from utils.theme import page_header, award_card
+from utils import instrumentation
 
 st.set_page_config(page_title="DBC - Leaderboards", page_icon="🏆", layout="wide")
+instrumentation.page("Leaderboards")
 
 st.markdown(page_header("Leaderboards", "Awards & Rankings"), unsafe_allow_html=True)
 
@@ -25,6 +29,8 @@ m_stats = member_stats()
 prop_perf = proposer_performance()
 agree = agreement_score()
 contrar = contrarian_index()
+book_odds = book_rank_intervals().set_index("Book")
+proposer_odds = proposer_rank_intervals().set_index("Proposer")
 
 # ===================================================================
 # BOOK AWARDS
@@ -63,7 +69,8 @@ col1, col2, col3 = st.columns(3)
 with col1:
     st.markdown(award_card(
         "❤️", "Most Loved", most_loved["Book"],
-        f"Avg Likeability: {most_loved['avg_like']:.2f}",
+        f"Avg Likeability: {most_loved['avg_like']:.2f} | "
+        f"#1 in {book_odds.loc[most_loved['Book'], 'P(#1)']:.0%} of resamples",
     ), unsafe_allow_html=True)
 with col2:
     st.markdown(award_card(
@@ -141,7 +148,8 @@ col1, col2, col3 = st.columns(3)
 with col1:
     st.markdown(award_card(
         "🎯", "MVP Proposer", mvp_proposer["Proposer"],
-        f"Avg Rating of Picks: {mvp_proposer['avg_like']:.2f}",
+        f"Avg Rating of Picks: {mvp_proposer['avg_like']:.2f} | "
+        f"#1 in {proposer_odds.loc[mvp_proposer['Proposer'], 'P(#1)']:.0%} of resamples",
     ), unsafe_allow_html=True)
 with col2:
     st.markdown(award_card(
@@ -184,6 +192,36 @@ with col7:
 
 st.divider()
 
+# ===================================================================
+# HOW SURE ARE WE?
+# ===================================================================
+st.subheader("How Sure Are We?")
+st.caption(
+    "Most books have only a handful of raters, so rankings are shaky. Each table resamples "
+    "the raters of every book 10,000 times: the 95% interval is where the average lands, and "
+    "P(#n) is how often it finishes n-th. Books with a single rater have no spread."
+)
+
+odds_format = {
+    "avg": "{:.2f}", "ci_low": "{:.2f}", "ci_high": "{:.2f}",
+    "P(#1)": "{:.0%}", "P(#2)": "{:.0%}", "P(#3)": "{:.0%}", "P(Top 3)": "{:.0%}",
+}
+col_books, col_proposers = st.columns(2)
+with col_books:
+    st.markdown("**Most Loved contenders**")
+    st.dataframe(
+        book_odds.head(10).style.format(odds_format),
+        use_container_width=True,
+    )
+with col_proposers:
+    st.markdown("**MVP Proposer contenders**")
+    st.dataframe(
+        proposer_odds.style.format(odds_format),
+        use_container_width=True,
+    )
+
+st.divider()
+
 # ===================================================================
 # YEARLY AWARDS
 # ===================================================================
@@ -5,9 +5,10 @@ import streamlit as st
 
 from utils.data_loader import get_book_summary, load_raw_data
 from utils.theme import COLORS, MEMBER_COLORS, metric_card_css, page_header, stat_card
-from utils import charts
+from utils import charts, instrumentation
 
 st.set_page_config(page_title="DBC - Timeline", page_icon="🍷", layout="wide")
+instrumentation.page("Timeline")
 
 # -- Header ------------------------------------------------------------------
 st.markdown(
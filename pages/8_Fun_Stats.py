@@ -1,7 +1,5 @@
 """Fun Stats page — quirky trivia and deep cuts from DBC data."""
 
-import numpy as np
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
@@ -11,14 +9,14 @@ from utils.data_loader import (
     get_ratings_long,
     get_book_summary,
     get_enriched_books,
-    MEMBERS,
 )
 from utils.calculations import (
     member_stats,
     proposer_bias,
     genre_distribution,
+    genre_ratings,
     seasonal_ratings,
-    cosine_similarity_books,
+    most_similar_book_pairs,
     taste_similarity_matrix,
     proposer_performance,
 )
@@ -30,9 +28,10 @@ from utils.theme import (
     stat_card,
     award_card,
 )
-from utils import charts
+from utils import charts, instrumentation
 
 st.set_page_config(page_title="DBC - Fun Stats", page_icon="🍷", layout="wide")
+instrumentation.page("Fun Stats")
 
 # -- Header ------------------------------------------------------------------
 st.markdown(
@@ -237,9 +236,8 @@ st.divider()
 st.subheader('"If You Liked X..."')
 st.caption("Most similar book pairs based on rating patterns (cosine similarity).")
 
-sim_df = cosine_similarity_books()
-if not sim_df.empty:
-    top_pairs = sim_df.head(5)
+top_pairs = most_similar_book_pairs(5)
+if not top_pairs.empty:
     for _, pair in top_pairs.iterrows():
         c1, c2, c3 = st.columns([3, 1, 3])
         c1.markdown(
@@ -355,23 +353,8 @@ st.divider()
 st.subheader("Prediction Corner")
 st.caption("Which genres should the club read more of? Average rating by genre.")
 
-# Build genre-rating mapping from enrichment + summary
-genre_ratings: dict[str, list[float]] = {}
-for book_name, book_data in enrichment.items():
-    genres = book_data.get("genres", [])
-    book_row = summary[summary["Book"] == book_name]
-    if book_row.empty or not genres:
-        continue
-    avg = book_row["avg_like"].values[0]
-    for g in genres:
-        genre_ratings.setdefault(g, []).append(avg)
-
-if genre_ratings:
-    genre_avg_df = pd.DataFrame([
-        {"Genre": g, "Avg Rating": np.mean(vals), "Books": len(vals)}
-        for g, vals in genre_ratings.items()
-    ]).sort_values("Avg Rating", ascending=False)
-
+genre_avg_df = genre_ratings()
+if not genre_avg_df.empty:
     fig_genre_rec = px.bar(
         genre_avg_df.head(15),
         x="Genre",
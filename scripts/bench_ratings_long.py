@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the wide-to-long ratings reshape used by get_ratings_long().
+
+Tiles the club sheet to larger sizes and times the original row-by-row
+iterrows() transform against the vectorized reshape in utils.data_loader,
+checking that both produce the same frame.
+
+Usage:
+    python bench_ratings_long.py                   # 1x, 10x, 100x, 1000x
+    python bench_ratings_long.py --scales 1 10     # custom size ladder
+    python bench_ratings_long.py --repeat 5        # best of 5 runs
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from utils.data_loader import load_raw_data, melt_ratings, read_members  # noqa: E402
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+# The row-by-row version is too slow to repeat at the largest sizes
+LEGACY_MAX_ROWS = 25_000
+
+
+def legacy_ratings_long(df, members):
+    """The original iterrows() implementation, kept here as the baseline."""
+    rows = []
+    for _, book_row in df.iterrows():
+        for member in members:
+            like_col = f"{member} - Likeability"
+            imp_col = f"{member} - Importance"
+            if like_col in df.columns and imp_col in df.columns:
+                like_val = book_row.get(like_col)
+                imp_val = book_row.get(imp_col)
+                if pd.notna(like_val) and pd.notna(imp_val):
+                    rows.append({
+                        "Book": book_row["Book"],
+                        "Date": book_row["Date"],
+                        "Proposer": book_row["Proposer"],
+                        "book_index": book_row["book_index"],
+                        "Member": member,
+                        "Likeability": float(like_val),
+                        "Importance": float(imp_val),
+                    })
+    return pd.DataFrame(rows)
+
+
+def tile_sheet(raw, scale):
+    """Repeat the sheet `scale` times with unique book names and indexes."""
+    tiled = pd.concat([raw] * scale, ignore_index=True)
+    copy_no = (tiled.index // len(raw)).astype(str)
+    tiled["Book"] = tiled["Book"] + " #" + copy_no
+    tiled["book_index"] = range(1, len(tiled) + 1)
+    return tiled
+
+
+def best_time(fn, df, repeat):
+    """Best wall-clock time of `repeat` calls, plus the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ratings reshape")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Multiples of the current sheet size to test")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    raw = load_raw_data()
+    members = read_members()
+    print(f"Base sheet: {len(raw)} books, {len(members)} members")
+    print(f"{'scale':>6} {'books':>9} {'ratings':>10} {'iterrows (s)':>13} {'numpy (s)':>10} {'speedup':>9}")
+
+    for scale in args.scales:
+        df = tile_sheet(raw, scale)
+        new_time, new_result = best_time(melt_ratings, df, args.repeat)
+
+        if len(df) <= LEGACY_MAX_ROWS:
+            old_time, old_result = best_time(lambda d: legacy_ratings_long(d, members), df, 1 if scale >= 100 else args.repeat)
+            pd.testing.assert_frame_equal(old_result, new_result)
+            old_str = f"{old_time:13.4f}"
+            speedup = f"{old_time / new_time:8.1f}x"
+        else:
+            old_str = f"{'skipped':>13}"
+            speedup = f"{'-':>9}"
+
+        print(f"{scale:>5}x {len(df):>9,} {len(new_result):>10,} {old_str} {new_time:10.4f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
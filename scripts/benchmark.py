@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Benchmark every public function in utils.data_loader and utils.calculations.
+
+For each rung of a size ladder, generates a synthetic club with
+generate_club_data.py, then times each function in a fresh worker process
+pointed at that data (DBC_DATA_DIR) with an empty cache (DBC_CACHE_DIR).
+Before every run, untimed, all in-process caches of both modules are
+emptied -- every st.cache_* and lru_cache function, private helpers such as
+the per-version indexes included, plus the memos in MEMOS -- and the
+snapshot is reloaded from the disk cache, so its lazily built parts (the
+member x book matrices, tensor indexes) are gone too. A run therefore
+times the function plus every derived structure it needs, starting from
+the loaded frames. Wall time is the best of --repeat runs; peak memory is
+measured by tracemalloc over one extra run. Snapshot loading itself is
+recorded separately, from CSV ("cold") and from the disk cache.
+
+Functions are discovered automatically. Those needing arguments get them
+from ARGUMENTS below; a new function that needs arguments shows up as
+"skipped" until it is added there. A function that takes longer than
+--max-seconds on one rung is skipped on the larger ones.
+
+Results are written as JSON. With --baseline, each (rung, function) pair is
+compared with a stored results file and the script exits non-zero when
+time or memory grew by more than --tolerance.
+
+Usage:
+    python benchmark.py                                  # full ladder -> benchmark_results.json
+    python benchmark.py --rungs tiny small               # subset of the ladder
+    python benchmark.py --only member_stats pairwise_correlation
+    python benchmark.py --output base.json               # store a baseline
+    python benchmark.py --baseline base.json             # compare against it
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+GENERATOR = os.path.join(SCRIPT_DIR, "generate_club_data.py")
+
+# name: (members, books, attendance)
+LADDER = {
+    "tiny": (7, 25, 0.6),
+    "small": (20, 200, 0.6),
+    "medium": (50, 1_000, 0.5),
+    "large": (200, 5_000, 0.3),
+    "xlarge": (1_000, 20_000, 0.1),
+}
+DEFAULT_RUNGS = ["tiny", "small", "medium", "large"]
+MODULES = ["utils.data_loader", "utils.calculations"]
+
+# Arguments for functions that require them, built from the loaded snapshot.
+# Called before every run, so functions that mutate their input get a fresh copy.
+ARGUMENTS = {
+    "clean_raw_data": lambda dl, s: (pd.read_csv(dl.source_path()),),
+    "compile_columns": lambda dl, s: (tuple(s.raw.columns),),
+    "ratings_block": lambda dl, s: (s.raw,),
+    "melt_ratings": lambda dl, s: (s.raw,),
+    "ratings_tensor": lambda dl, s: (s.raw,),
+    "compact_ratings": lambda dl, s: (s.ratings,),
+    "summarize_books": lambda dl, s: (s.ratings, s.raw),
+    "get_book_ratings": lambda dl, s: (s.books[len(s.books) // 2],),
+    "get_member_ratings": lambda dl, s: (s.members[0],),
+    "get_book_enrichment": lambda dl, s: (s.books[len(s.books) // 2],),
+    "top_k_similar": lambda dl, s: (s.books[len(s.books) // 2],),
+    "prediction_vs_actual": lambda dl, s: (s.members[0],),
+    "permutation_count": lambda dl, s: (len(s.members) * (len(s.members) - 1) // 2, len(s.books)),
+}
+
+# Module-level memos that are not st.cache / lru_cache functions, e.g. the
+# rating model's warm start, emptied along with the caches before every run
+MEMOS = {"utils.calculations": ["_last_rating_models"]}
+
+# Differences smaller than these are noise, whatever the ratio
+MIN_SECONDS = 0.005
+MIN_MB = 0.5
+
+
+# ---------------------------------------------------------------------------
+# Worker: runs inside a fresh process for one rung
+# ---------------------------------------------------------------------------
+
+def public_functions(module):
+    """Public functions defined in `module`, including st.cache / lru_cache wrappers."""
+    found = []
+    for name, obj in vars(module).items():
+        if name.startswith("_") or isinstance(obj, type) or not callable(obj):
+            continue
+        if getattr(obj, "__module__", None) == module.__name__:
+            found.append((name, obj))
+    return found
+
+
+def needs_arguments(fn):
+    try:
+        params = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.default is p.empty and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params)
+
+
+def cached_functions(module):
+    """Every st.cache / lru_cache function defined in `module`, private ones included."""
+    return [
+        obj for obj in vars(module).values()
+        if callable(obj) and not isinstance(obj, type)
+        and getattr(obj, "__module__", None) == module.__name__
+        and (hasattr(obj, "clear") or hasattr(obj, "cache_clear"))
+    ]
+
+
+def reset(fn):
+    """Drop a function's own memo."""
+    if hasattr(fn, "clear"):
+        fn.clear()
+    if hasattr(fn, "cache_clear"):
+        fn.cache_clear()
+
+
+def cold_start(dl, modules):
+    """Empty every in-process cache of `modules`, then reload the snapshot.
+
+    The snapshot comes back from the disk cache as a new object, without
+    any of its cached properties.
+    """
+    for module in modules:
+        for fn in cached_functions(module):
+            reset(fn)
+        for name in MEMOS.get(module.__name__, []):
+            getattr(module, name).clear()
+    dl.get_snapshot()
+
+
+def measure(fn, make_args, repeat, max_seconds, prepare=tuple):
+    """Best wall time over `repeat` runs, then peak traced memory of one run.
+
+    `prepare` runs untimed before each run. Functions slower than
+    `max_seconds` are not rerun for memory (peak None).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        prepare()
+        args = make_args()
+        reset(fn)
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+        if best > max_seconds / repeat:
+            break
+    if best > max_seconds:
+        return best, None
+
+    prepare()
+    args = make_args()
+    reset(fn)
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def run_worker(args):
+    import importlib
+
+    logging.disable(logging.CRITICAL)
+    from utils import data_loader as dl
+
+    results = []
+
+    def record(name, status, seconds=None, peak_mb=None, detail=""):
+        results.append({
+            "function": name, "status": status,
+            "seconds": seconds, "peak_mb": peak_mb, "detail": detail,
+        })
+
+    # Snapshot loads: from CSV with an empty disk cache, then from the disk cache
+    start = time.perf_counter()
+    snapshot = dl.get_snapshot()
+    record("utils.data_loader.get_snapshot[cold]", "ok", time.perf_counter() - start)
+
+    def load_from_disk():
+        dl._build_snapshot.clear()
+        return dl.get_snapshot()
+
+    seconds, peak = measure(load_from_disk, tuple, args.repeat, args.max_seconds)
+    record("utils.data_loader.get_snapshot[disk]", "ok", seconds, peak)
+    snapshot = dl.get_snapshot()
+
+    meta = {"books": len(snapshot.books), "members": len(snapshot.members), "ratings": len(snapshot.ratings)}
+    skip = set(args.skip or [])
+    only = set(args.only or [])
+    modules = [importlib.import_module(module_name) for module_name in MODULES]
+
+    def prepare():
+        cold_start(dl, modules)
+
+    for module in modules:
+        module_name = module.__name__
+        for name, fn in public_functions(module):
+            full_name = f"{module_name}.{name}"
+            if (only and name not in only) or name == "get_snapshot":
+                continue
+            if full_name in skip:
+                record(full_name, "skipped", detail=f"slower than {args.max_seconds}s on a smaller rung")
+                continue
+            if name in ARGUMENTS:
+                make_args = lambda factory=ARGUMENTS[name]: factory(dl, dl.get_snapshot())  # noqa: E731
+            elif needs_arguments(fn):
+                record(full_name, "skipped", detail="needs arguments; add it to ARGUMENTS")
+                continue
+            else:
+                make_args = tuple
+            try:
+                seconds, peak = measure(fn, make_args, args.repeat, args.max_seconds, prepare)
+            except Exception as exc:  # noqa: BLE001 - report and keep benchmarking
+                record(full_name, "error", detail=f"{type(exc).__name__}: {exc}")
+                continue
+            record(full_name, "ok", seconds, peak)
+
+    json.dump({"meta": meta, "results": results}, sys.stdout)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def generate(rung, out_dir, seed):
+    members, books, attendance = LADDER[rung]
+    subprocess.run(
+        [sys.executable, GENERATOR, "--out-dir", out_dir, "--members", str(members),
+         "--books", str(books), "--attendance", str(attendance), "--seed", str(seed)],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+def run_rung(rung, workdir, args, skip):
+    data_dir = os.path.join(workdir, rung)
+    generate(rung, data_dir, args.seed)
+
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker",
+           "--repeat", str(args.repeat), "--max-seconds", str(args.max_seconds)]
+    if skip:
+        cmd += ["--skip", *sorted(skip)]
+    if args.only:
+        cmd += ["--only", *args.only]
+    env = dict(os.environ, DBC_DATA_DIR=data_dir, DBC_CACHE_DIR=os.path.join(data_dir, ".cache"))
+    for var in ("DBC_SHEET_URL",):
+        env.pop(var, None)
+    proc = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True)
+    return json.loads(proc.stdout)
+
+
+def compare(results, baseline, tolerance):
+    """Print a comparison table; return the number of regressions."""
+    base = {(r["rung"], r["function"]): r for r in baseline["results"] if r["status"] == "ok"}
+    regressions = 0
+    print(f"\n{'rung':<8} {'function':<55} {'time':>9} {'base':>9} {'ratio':>7} {'MB':>8} {'base':>8}")
+    for r in results:
+        b = base.get((r["rung"], r["function"]))
+        if r["status"] != "ok" or b is None:
+            continue
+        t_ratio = r["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        slower = t_ratio > 1 + tolerance and r["seconds"] - b["seconds"] > MIN_SECONDS
+        bigger = (
+            r["peak_mb"] is not None and b["peak_mb"] is not None
+            and r["peak_mb"] > b["peak_mb"] * (1 + tolerance) and r["peak_mb"] - b["peak_mb"] > MIN_MB
+        )
+        flag = "  REGRESSION" if slower or bigger else ""
+        regressions += bool(flag)
+        peak = f"{r['peak_mb']:8.2f}" if r["peak_mb"] is not None else f"{'-':>8}"
+        base_peak = f"{b['peak_mb']:8.2f}" if b["peak_mb"] is not None else f"{'-':>8}"
+        print(
+            f"{r['rung']:<8} {r['function']:<55} {r['seconds']:9.4f} {b['seconds']:9.4f} "
+            f"{t_ratio:6.2f}x {peak} {base_peak}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data loader and analytics functions")
+    parser.add_argument("--rungs", nargs="+", choices=list(LADDER), default=DEFAULT_RUNGS,
+                        help="Dataset sizes to run, smallest first")
+    parser.add_argument("--only", nargs="+", help="Only benchmark these function names")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="Skip a function on larger rungs once it takes longer than this")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown / memory growth before flagging a regression")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--skip", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = []
+    skip = set()
+    rungs = sorted(args.rungs, key=list(LADDER).index)
+    with tempfile.TemporaryDirectory(prefix="dbc-bench-") as workdir:
+        for rung in rungs:
+            print(f"[{rung}] {LADDER[rung][0]:,} members x {LADDER[rung][1]:,} books ...", flush=True)
+            out = run_rung(rung, workdir, args, skip)
+            for r in out["results"]:
+                results.append({"rung": rung, **out["meta"], **r})
+                if r["status"] == "ok" and r["seconds"] > args.max_seconds:
+                    skip.add(r["function"])
+                seconds = f"{r['seconds']:.4f}s" if r["seconds"] is not None else r["status"]
+                peak = f"{r['peak_mb']:.2f} MB" if r["peak_mb"] is not None else ""
+                print(f"    {r['function']:<55} {seconds:>12} {peak:>12}")
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} measurements to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Synthetic club-data generator for scale testing.
+
+Writes a ratings CSV in the exact "DrunkBookClub - Sheet1.csv" schema plus a
+matching book_enrichment.json, for any number of members and books. Output
+is fully determined by the seed.
+
+Ratings are a per-book quality plus a per-member bias plus noise, clipped to
+1-5 and rounded to --step. Each member attends a book with probability
+--attendance (the proposer always attends), and proposers are drawn with
+weight rank ** -proposer_skew, so 0 means everyone proposes equally often.
+
+Point the dashboard at the output with DBC_DATA_DIR=<out-dir>; its parsed
+cache then lives in <out-dir>/.cache, apart from the real sheet's.
+
+Usage:
+    python generate_club_data.py --out-dir /tmp/club                 # 40 members, 1,000 books
+    python generate_club_data.py --out-dir /tmp/club --members 10000 --books 100000
+    python generate_club_data.py --out-dir /tmp/club --attendance 0.05 --proposer-skew 1.2
+    python generate_club_data.py --out-dir /tmp/club --like-mean 3.8 --like-sd 0.6 --step 0.5
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CSV_NAME = "DrunkBookClub - Sheet1.csv"
+ENRICHMENT_NAME = "book_enrichment.json"
+
+FIRST_MEETING = pd.Timestamp("2023-10-03")
+MEETING_DAYS = 30
+# Keep dates inside the range pandas can represent; past this, meetings share dates
+LAST_MEETING = pd.Timestamp("2199-12-31")
+CHUNK_BOOKS = 5_000
+
+GENRES = [
+    "Literary Fiction", "Nonfiction", "Science Fiction", "History", "Historical Fiction",
+    "Classic", "Adventure", "Politics", "Science", "Biography", "Fantasy", "Mystery",
+    "Satire", "Thriller", "Contemporary", "Dystopian", "Magical Realism", "True Crime",
+    "Romance", "Business", "Technology", "Memoir", "Horror", "Poetry",
+]
+MOODS = ["atmospheric", "bleak", "cerebral", "gripping", "lyrical", "satirical", "tense", "thought-provoking"]
+DIFFICULTIES = ["easy", "moderate", "challenging"]
+THEMES = [
+    "ambition", "betrayal", "class", "democracy", "empire", "family", "identity",
+    "isolation", "memory", "power", "survival", "technology", "war",
+]
+
+
+def member_names(n_members):
+    width = len(str(n_members))
+    return [f"Member {i:0{width}d}" for i in range(1, n_members + 1)]
+
+
+def book_names(n_books):
+    width = len(str(n_books))
+    return [f"Book {i:0{width}d}" for i in range(1, n_books + 1)]
+
+
+def meeting_dates(n_books):
+    """Monthly meetings, squeezed together when they would run past LAST_MEETING."""
+    span = min(MEETING_DAYS * n_books, (LAST_MEETING - FIRST_MEETING).days)
+    offsets = np.arange(n_books) * span // max(n_books, 1)
+    return FIRST_MEETING + pd.to_timedelta(offsets, unit="D")
+
+
+def proposer_weights(n_members, skew):
+    weights = np.arange(1, n_members + 1, dtype=float) ** -skew
+    return weights / weights.sum()
+
+
+def draw_ratings(rng, quality, bias, sd, step, shape):
+    values = quality[:, None] + bias[None, :] + rng.normal(0.0, sd, size=shape)
+    return np.clip(np.round(values / step) * step, 1, 5)
+
+
+def ratings_chunk(rng, args, members, books, dates, proposers, like_bias, imp_bias):
+    """Sheet rows for one slice of books."""
+    n_books, n_members = len(books), len(like_bias)
+    shape = (n_books, n_members)
+
+    like_quality = rng.normal(args.like_mean, args.book_sd, size=n_books)
+    imp_quality = rng.normal(args.imp_mean, args.book_sd, size=n_books)
+    like = draw_ratings(rng, like_quality, like_bias, args.like_sd, args.step, shape)
+    imp = draw_ratings(rng, imp_quality, imp_bias, args.imp_sd, args.step, shape)
+
+    attended = rng.random(shape) < args.attendance
+    attended[np.arange(n_books), proposers] = True
+    like[~attended] = np.nan
+    imp[~attended] = np.nan
+
+    # Member columns interleave Likeability and Importance, as in the sheet
+    block = np.stack([like, imp], axis=-1).reshape(n_books, 2 * n_members)
+    meta = pd.DataFrame({
+        "Book": books,
+        "Proposer": np.asarray(members, dtype=object)[proposers],
+        "Date": [f"{d.month}/{d.day}/{d.year}" for d in dates],
+        "Average Likeability": np.nanmean(like, axis=1),
+        "Average Importance": np.nanmean(imp, axis=1),
+    })
+    columns = [f"{m} - {metric}" for m in members for metric in ("Likeability", "Importance")]
+    return pd.concat([meta, pd.DataFrame(block, columns=columns)], axis=1)
+
+
+def enrichment_record(rng, book, year):
+    genres = rng.choice(GENRES, size=rng.integers(1, 5), replace=False).tolist()
+    return {
+        "full_title": f"{book}: A Novel",
+        "author": f"Author {rng.integers(1, 10_000):04d}",
+        "publication_year": int(year),
+        "genres": genres,
+        "pages": int(rng.integers(120, 900)),
+        "isbn": "978" + "".join(map(str, rng.integers(0, 10, size=10))),
+        "cover_url": "",
+        "plot_summary": f"A synthetic {genres[0].lower()} title generated for scale testing.",
+        "fun_facts": [],
+        "awards": [],
+        "goodreads_url": "",
+        "goodreads_rating": round(float(rng.uniform(3.0, 4.7)), 2),
+        "themes": rng.choice(THEMES, size=3, replace=False).tolist(),
+        "mood": str(rng.choice(MOODS)),
+        "difficulty": str(rng.choice(DIFFICULTIES)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic book-club sheet and enrichment file")
+    parser.add_argument("--out-dir", required=True, help="Directory to write the CSV and enrichment JSON to")
+    parser.add_argument("--members", type=int, default=40, help="Number of members")
+    parser.add_argument("--books", type=int, default=1_000, help="Number of books")
+    parser.add_argument("--attendance", type=float, default=0.7,
+                        help="Probability that a member rates a given book (1 - sparsity)")
+    parser.add_argument("--proposer-skew", type=float, default=0.0,
+                        help="Zipf exponent for who proposes books (0 = uniform)")
+    parser.add_argument("--like-mean", type=float, default=3.3, help="Mean Likeability")
+    parser.add_argument("--like-sd", type=float, default=0.8, help="Likeability noise per rating")
+    parser.add_argument("--imp-mean", type=float, default=2.6, help="Mean Importance")
+    parser.add_argument("--imp-sd", type=float, default=0.8, help="Importance noise per rating")
+    parser.add_argument("--book-sd", type=float, default=0.7, help="Spread of per-book quality")
+    parser.add_argument("--member-sd", type=float, default=0.4, help="Spread of per-member bias")
+    parser.add_argument("--step", type=float, default=1.0, help="Rating granularity (1 or 0.5)")
+    parser.add_argument("--no-enrichment", action="store_true", help="Skip writing book_enrichment.json")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    if args.members < 1 or args.books < 1:
+        parser.error("--members and --books must be at least 1")
+    if not 0 < args.attendance <= 1:
+        parser.error("--attendance must be in (0, 1]")
+
+    rng = np.random.default_rng(args.seed)
+    members = member_names(args.members)
+    books = book_names(args.books)
+    dates = meeting_dates(args.books)
+    proposers = rng.choice(args.members, size=args.books, p=proposer_weights(args.members, args.proposer_skew))
+    like_bias = rng.normal(0.0, args.member_sd, size=args.members)
+    imp_bias = rng.normal(0.0, args.member_sd, size=args.members)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    csv_path = os.path.join(args.out_dir, CSV_NAME)
+    with open(csv_path, "w", newline="") as f:
+        for start in range(0, args.books, CHUNK_BOOKS):
+            stop = min(start + CHUNK_BOOKS, args.books)
+            chunk = ratings_chunk(
+                rng, args, members, books[start:stop], dates[start:stop], proposers[start:stop], like_bias, imp_bias,
+            )
+            chunk.to_csv(f, index=False, header=start == 0, float_format="%g")
+    print(f"Wrote {args.books:,} books x {args.members:,} members to {csv_path}")
+
+    if not args.no_enrichment:
+        enrichment_path = os.path.join(args.out_dir, ENRICHMENT_NAME)
+        years = rng.integers(1850, 2024, size=args.books)
+        enrichment = {book: enrichment_record(rng, book, year) for book, year in zip(books, years)}
+        with open(enrichment_path, "w", encoding="utf-8") as f:
+            json.dump(enrichment, f, indent=2, ensure_ascii=False)
+        print(f"Wrote enrichment for {len(enrichment):,} books to {enrichment_path}")
+
+
+if __name__ == "__main__":
+    main()
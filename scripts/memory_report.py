@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Memory report for the long ratings frame: default vs compact layout.
+
+Builds a synthetic long ratings frame with the same columns as
+get_ratings_long(), converts it with utils.data_loader.compact_ratings(),
+and prints the deep memory usage of every column in both layouts.
+
+Usage:
+    python memory_report.py                      # 1M ratings
+    python memory_report.py --ratings 5000000    # custom size
+    python memory_report.py --members 60 --seed 7
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from utils.data_loader import compact_ratings  # noqa: E402
+
+
+def synthetic_ratings(n_ratings, n_members, seed):
+    """Long ratings frame with roughly `n_ratings` rows, 70% attendance."""
+    rng = np.random.default_rng(seed)
+    members = np.array([f"Member {i:03d}" for i in range(n_members)], dtype=object)
+    n_books = max(1, int(n_ratings / (n_members * 0.7)))
+
+    book_idx = np.arange(1, n_books + 1)
+    dates = pd.Timestamp("2023-10-03") + pd.to_timedelta(book_idx * 30, unit="D")
+    proposers = rng.choice(members, size=n_books)
+
+    attended = rng.random((n_books, n_members)) < 0.7
+    rows, cols = np.nonzero(attended)
+    rows, cols = rows[:n_ratings], cols[:n_ratings]
+
+    return pd.DataFrame({
+        "Book": np.array([f"Book {i}" for i in book_idx], dtype=object)[rows],
+        "Date": dates[rows],
+        "Proposer": proposers[rows],
+        "book_index": book_idx[rows],
+        "Member": members[cols],
+        "Likeability": rng.integers(1, 6, size=len(rows)).astype(float),
+        "Importance": rng.integers(1, 6, size=len(rows)).astype(float),
+    })
+
+
+def column_bytes(df):
+    return df.memory_usage(deep=True, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ratings frame memory layouts")
+    parser.add_argument("--ratings", type=int, default=1_000_000, help="Number of ratings to generate")
+    parser.add_argument("--members", type=int, default=40, help="Number of members")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    default = synthetic_ratings(args.ratings, args.members, args.seed)
+    compact = compact_ratings(default)
+    before, after = column_bytes(default), column_bytes(compact)
+
+    mb = 1024 * 1024
+    print(f"{len(default):,} ratings, {default['Book'].nunique():,} books, {args.members} members\n")
+    print(f"{'column':<12} {'default dtype':<16} {'MB':>8}   {'compact dtype':<16} {'MB':>8} {'ratio':>7}")
+    for col in default.columns:
+        print(
+            f"{col:<12} {str(default[col].dtype):<16} {before[col] / mb:8.2f}   "
+            f"{str(compact[col].dtype)[:16]:<16} {after[col] / mb:8.2f} {before[col] / after[col]:6.1f}x"
+        )
+    print(
+        f"{'total':<12} {'':<16} {before.sum() / mb:8.2f}   {'':<16} "
+        f"{after.sum() / mb:8.2f} {before.sum() / after.sum():6.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
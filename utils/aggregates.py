@@ -0,0 +1,108 @@
+"""Mergeable running statistics per book, member and proposer.
+
+For every key the store keeps, per metric, the count, mean, M2 (sum of
+squared deviations from the mean), min and max. A batch of new ratings is
+reduced to the same statistics and folded in with Chan et al.'s parallel
+form of Welford's update, so ingesting k new ratings costs O(k) plus one
+pass over the keys, never a pass over the full history. Tables are plain
+frames, persisted with the rest of the cache entry.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ("Book", "Member", "Proposer")
+METRICS = {"Likeability": "like", "Importance": "imp"}
+
+
+def frame_name(dimension: str) -> str:
+    """Cache frame name for a dimension's table."""
+    return f"agg_{dimension.lower()}"
+
+
+def batch_stats(ratings: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    """count / mean / m2 / min / max per key of `dimension` for a batch of ratings."""
+    grouped = ratings.groupby(dimension, observed=True)
+    table = pd.DataFrame({"count": grouped.size()})
+    for metric, suffix in METRICS.items():
+        values = grouped[metric]
+        table[f"mean_{suffix}"] = values.mean()
+        table[f"m2_{suffix}"] = values.var(ddof=0).fillna(0.0) * table["count"]
+        table[f"min_{suffix}"] = values.min()
+        table[f"max_{suffix}"] = values.max()
+    table.index.name = dimension
+    return table.astype(float).astype({"count": np.int64})
+
+
+def merge(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Combine two stat tables over disjoint batches of ratings (Chan et al.)."""
+    # Sorted, as groupby orders its keys
+    keys = a.index.union(b.index)
+    a = a.reindex(keys)
+    b = b.reindex(keys)
+    n_a = a["count"].fillna(0).to_numpy()
+    n_b = b["count"].fillna(0).to_numpy()
+    n = n_a + n_b
+
+    merged = pd.DataFrame({"count": n.astype(np.int64)}, index=keys)
+    for suffix in METRICS.values():
+        mean_a = a[f"mean_{suffix}"].fillna(0).to_numpy()
+        mean_b = b[f"mean_{suffix}"].fillna(0).to_numpy()
+        delta = mean_b - mean_a
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight_b = np.where(n > 0, n_b / n, 0.0)
+        merged[f"mean_{suffix}"] = mean_a + delta * weight_b
+        merged[f"m2_{suffix}"] = (
+            a[f"m2_{suffix}"].fillna(0).to_numpy()
+            + b[f"m2_{suffix}"].fillna(0).to_numpy()
+            + delta * delta * n_a * weight_b
+        )
+        merged[f"min_{suffix}"] = np.fmin(a[f"min_{suffix}"].to_numpy(), b[f"min_{suffix}"].to_numpy())
+        merged[f"max_{suffix}"] = np.fmax(a[f"max_{suffix}"].to_numpy(), b[f"max_{suffix}"].to_numpy())
+    return merged
+
+
+@dataclass(frozen=True)
+class AggregateStore:
+    """Running statistics tables, one per dimension, indexed by key."""
+
+    tables: dict[str, pd.DataFrame]
+
+    @classmethod
+    def from_ratings(cls, ratings: pd.DataFrame) -> "AggregateStore":
+        return cls({dim: batch_stats(ratings, dim) for dim in DIMENSIONS})
+
+    def update(self, new_ratings: pd.DataFrame) -> "AggregateStore":
+        """A new store with `new_ratings` folded in; this one is unchanged."""
+        return AggregateStore({
+            dim: merge(self.tables[dim], batch_stats(new_ratings, dim)) for dim in DIMENSIONS
+        })
+
+    def to_frames(self) -> dict[str, pd.DataFrame]:
+        return {frame_name(dim): table.reset_index() for dim, table in self.tables.items()}
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, pd.DataFrame]) -> "AggregateStore":
+        return cls({
+            dim: frames[frame_name(dim)].set_index(dim).astype({"count": np.int64})
+            for dim in DIMENSIONS
+        })
+
+    def summary(self, dimension: str) -> pd.DataFrame:
+        """avg_like / avg_imp / std_like / std_imp / num_raters per key.
+
+        Standard deviations use ddof=1 and are NaN for single ratings, as
+        pandas' std() would give.
+        """
+        table = self.tables[dimension]
+        count = table["count"]
+        result = pd.DataFrame(index=table.index)
+        for suffix in METRICS.values():
+            result[f"avg_{suffix}"] = table[f"mean_{suffix}"]
+        for suffix in METRICS.values():
+            var = table[f"m2_{suffix}"] / (count - 1).where(count > 1)
+            result[f"std_{suffix}"] = np.sqrt(var.clip(lower=0))
+        result["num_raters"] = count
+        return result
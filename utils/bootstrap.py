@@ -0,0 +1,94 @@
+"""Bootstrap resampling of group means, with intervals and rank probabilities.
+
+Ratings are laid out contiguously by group (e.g. by book). One resample
+draws, for every group, as many ratings as it has, with replacement, from
+that group only; the resampled group means are then a segment sum
+(np.add.reduceat) over one gathered array. Resamples run in seeded batches
+(utils.parallel), so results depend only on the seed, and large jobs spread
+the batches over a process pool.
+"""
+
+import numpy as np
+
+from utils.parallel import run_batches, split_batches
+
+# Resamples per batch; batches are the unit of work handed to a process
+BATCH_RESAMPLES = 250
+# Upper bound on the (resamples x ratings) index block drawn at once
+BLOCK_CELLS = 4_000_000
+# Breaks exact ties between means at random when ranking, far below any real gap
+_TIE_JITTER = 1e-9
+
+
+def _resample_batch(values: np.ndarray, sizes: np.ndarray, n_resamples: int, seed) -> np.ndarray:
+    """(n_resamples x groups) resampled means, float32."""
+    rng = np.random.default_rng(seed)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    first = np.repeat(starts, sizes)
+    width = np.repeat(sizes, sizes).astype(np.float32)
+
+    means = np.empty((n_resamples, len(sizes)), dtype=np.float32)
+    block = max(1, BLOCK_CELLS // max(len(values), 1))
+    for lo in range(0, n_resamples, block):
+        hi = min(lo + block, n_resamples)
+        offsets = (rng.random((hi - lo, len(values)), dtype=np.float32) * width).astype(np.int64)
+        # float32 rounding can land exactly on the group size
+        np.minimum(offsets, width.astype(np.int64) - 1, out=offsets)
+        sums = np.add.reduceat(values[first + offsets], starts, axis=1)
+        means[lo:hi] = sums / sizes
+    return means
+
+
+def resample_means(
+    values: np.ndarray,
+    sizes: np.ndarray,
+    n_resamples: int = 10_000,
+    seed: int = 0,
+    workers: int | None = None,
+) -> np.ndarray:
+    """Bootstrap distribution of every group's mean.
+
+    `values` holds the observations grouped contiguously and `sizes` the
+    (non-zero) length of each group, in order. Returns an
+    (n_resamples x groups) float32 array. `workers` defaults to the CPU
+    count; 1 keeps everything in this process.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    batches = split_batches(n_resamples, BATCH_RESAMPLES, seed)
+    tasks = [(values, sizes, count, batch_seed) for count, batch_seed in batches]
+    batches = run_batches(_resample_batch, tasks, n_resamples * len(values), workers)
+    if not batches:
+        return np.empty((0, len(sizes)), dtype=np.float32)
+    return np.concatenate(batches)
+
+
+def percentile_intervals(samples: np.ndarray, level: float = 0.95) -> tuple[np.ndarray, np.ndarray]:
+    """Per-column (low, high) percentile bounds of a bootstrap sample."""
+    tail = (1 - level) / 2
+    low, high = np.quantile(samples, [tail, 1 - tail], axis=0)
+    return low, high
+
+
+def rank_probabilities(samples: np.ndarray, top: int = 3, seed: int = 0) -> np.ndarray:
+    """(columns x top) share of resamples where each column ranks 1st, 2nd, ...
+
+    Highest mean ranks first. Exact ties are split at random.
+    """
+    n_samples, n_cols = samples.shape
+    top = min(top, n_cols)
+    counts = np.zeros(n_cols * top, dtype=np.int64)
+    if n_samples == 0 or top == 0:
+        return counts.reshape(n_cols, top).astype(float)
+
+    rng = np.random.default_rng(seed)
+    slots = np.arange(top)
+    block = max(1, BLOCK_CELLS // n_cols)
+    for lo in range(0, n_samples, block):
+        scores = samples[lo:lo + block].astype(np.float64)
+        scores += rng.random(scores.shape) * _TIE_JITTER
+        leaders = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        order = np.argsort(-np.take_along_axis(scores, leaders, axis=1), axis=1)
+        leaders = np.take_along_axis(leaders, order, axis=1)
+        counts += np.bincount((leaders * top + slots).ravel(), minlength=n_cols * top)
+    return counts.reshape(n_cols, top) / n_samples
@@ -0,0 +1,125 @@
+"""On-disk columnar cache for parsed DBC data frames.
+
+Frames are stored as Parquet files under ``<data dir>/.cache/<key>/`` (or
+``$DBC_CACHE_DIR/<key>/``), where the key identifies the source content and
+loader schema. A fresh process (or a new replica) that finds its key on disk
+skips CSV parsing entirely.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Point at another sheet + enrichment pair, e.g. from scripts/generate_club_data.py
+DATA_DIR = Path(os.environ.get("DBC_DATA_DIR", Path(__file__).parent.parent / "data"))
+# DBC_CACHE_DIR wins; otherwise the cache lives inside the data directory, so
+# a club under DBC_DATA_DIR never shares (or prunes) the repo sheet's entries
+CACHE_DIR = Path(os.environ.get("DBC_CACHE_DIR", DATA_DIR / ".cache"))
+
+
+def entry_dir(key: str) -> Path:
+    """Directory holding the frames for a cache key."""
+    return CACHE_DIR / key
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write `data` to a temporary sibling file, then rename it over `path`.
+
+    Readers see either the old content or the new, never a partial file.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def read_frame(key: str, name: str) -> pd.DataFrame | None:
+    """Read one cached frame, or None if it is missing or unreadable."""
+    path = entry_dir(key) / f"{name}.parquet"
+    if not path.exists():
+        return None
+    try:
+        return pd.read_parquet(path)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def read_array(key: str, name: str, mmap_mode: str | None = None) -> np.ndarray | None:
+    """Read a cached array, optionally memory-mapped; None if missing."""
+    path = entry_dir(key) / f"{name}.npy"
+    if not path.exists():
+        return None
+    try:
+        return np.load(path, mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+        return None
+
+
+def read_manifest(key: str) -> dict | None:
+    """Read the manifest stored alongside a cache entry."""
+    try:
+        with open(entry_dir(key) / "manifest.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def latest_entry(prefix: str = "") -> tuple[str, dict] | None:
+    """Most recently written entry whose key starts with `prefix`."""
+    if not CACHE_DIR.exists():
+        return None
+    entries = [
+        path for path in CACHE_DIR.iterdir()
+        if path.is_dir() and path.name.startswith(prefix) and not path.name.startswith(".")
+    ]
+    for path in sorted(entries, key=lambda p: p.stat().st_mtime, reverse=True):
+        manifest = read_manifest(path.name)
+        if manifest is not None:
+            return path.name, manifest
+    return None
+
+
+def write_frames(
+    key: str,
+    frames: dict[str, pd.DataFrame],
+    manifest: dict | None = None,
+    arrays: dict[str, np.ndarray] | None = None,
+) -> None:
+    """Persist frames under a key and drop entries for older data versions.
+
+    The entry is written to a temporary directory and renamed into place, so
+    concurrent readers never see a half-written entry. `manifest` is stored
+    as JSON next to the frames and `arrays` as .npy files. Failures (no
+    Parquet engine, read-only disk) are ignored; the cache is purely an
+    optimization.
+    """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=CACHE_DIR))
+        tmp.chmod(0o755)
+    except OSError:
+        return
+    try:
+        for name, frame in frames.items():
+            frame.to_parquet(tmp / f"{name}.parquet")
+        for name, array in (arrays or {}).items():
+            np.save(tmp / f"{name}.npy", array)
+        with open(tmp / "manifest.json", "w") as f:
+            json.dump(manifest or {}, f)
+        os.replace(tmp, entry_dir(key))
+    except (ImportError, OSError, ValueError):
+        # Another process may have published the same key first
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+    prune(keep=key)
+
+
+def prune(keep: str) -> None:
+    """Remove every cache entry except `keep` (stale data versions)."""
+    for path in CACHE_DIR.iterdir():
+        if path.is_dir() and path.name != keep and not path.name.startswith("."):
+            shutil.rmtree(path, ignore_errors=True)
@@ -1,40 +1,118 @@
 """Derived metrics and statistical calculations for DBC dashboard."""
 
+import sys
+
 import numpy as np
 import pandas as pd
-from scipy import stats
-
-from utils.data_loader import (
-    get_ratings_long,
-    get_book_summary,
-    get_member_book_matrix,
-    MEMBERS,
-)
-
-
-def member_stats() -> pd.DataFrame:
-    """Per-member statistics: avg ratings, std dev, attendance, etc."""
-    ratings = get_ratings_long()
-    total_books = ratings["Book"].nunique()
-
-    rows = []
-    for member in MEMBERS:
-        mr = ratings[ratings["Member"] == member]
-        if mr.empty:
-            continue
-        rows.append({
-            "Member": member,
-            "Books Rated": len(mr),
-            "Attendance Rate": len(mr) / total_books,
-            "Avg Likeability Given": mr["Likeability"].mean(),
-            "Avg Importance Given": mr["Importance"].mean(),
-            "Std Likeability": mr["Likeability"].std(),
-            "Std Importance": mr["Importance"].std(),
-            "Min Likeability": mr["Likeability"].min(),
-            "Max Likeability": mr["Likeability"].max(),
-            "Range Likeability": mr["Likeability"].max() - mr["Likeability"].min(),
-        })
-    return pd.DataFrame(rows)
+import streamlit as st
+
+from utils import instrumentation
+from utils.aggregates import AggregateStore, batch_stats
+from utils.bootstrap import percentile_intervals, rank_probabilities, resample_means
+from utils.correlation import pairwise_pearson, pearson_pvalues, permutation_pvalues
+from utils.data_loader import get_enriched_books, get_snapshot
+from utils.factorization import Factorization, fit_als
+from utils.genre_index import GenreIndex
+from utils.similarity import TopKIndex, cosine_matrix
+from utils.threshold_index import ThresholdIndex
+from utils.trends import PrefixSums
+
+# Neighbours kept per book by the similarity index
+SIMILAR_BOOKS_K = 20
+
+# Bootstrap resamples behind the leaderboard intervals, and their seed
+BOOTSTRAP_RESAMPLES = 10_000
+BOOTSTRAP_SEED = 0
+
+# Random shuffles per member pair for permutation p-values. Every shuffle
+# touches (pairs x widest shared-book set) cells, so big clubs get fewer:
+# at most PERMUTATION_CELLS cells per test, but never under MIN_PERMUTATIONS
+# (smallest p-value about 0.005, well clear of the 0.05 cut)
+PERMUTATIONS = 10_000
+MIN_PERMUTATIONS = 200
+PERMUTATION_CELLS = 500_000_000
+
+# Rating model: factor rank and ridge penalty, picked by held-out RMSE on the club's ratings
+RATING_MODEL_RANK = 1
+RATING_MODEL_REG = 2.0
+
+# Likeability deviation columns under the names the pages expect
+_LIKE_DEVIATION_COLUMNS = {"book_avg_like": "book_avg", "dev_like": "deviation", "abs_dev_like": "abs_deviation"}
+
+
+def member_stats(start: pd.Timestamp | None = None, end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Per-member statistics: avg ratings, std dev, attendance, etc.
+
+    `start` / `end` (inclusive) restrict the stats to books discussed in that
+    window; attendance is then relative to the books in the window.
+    """
+    snapshot = get_snapshot()
+    if start is None and end is None:
+        # Full history: read the running per-member aggregates kept with the data
+        aggregates = snapshot.aggregates
+        total_books = len(aggregates.tables["Book"])
+    else:
+        ratings = snapshot.ratings
+        dates = ratings["Date"]
+        if isinstance(dates.dtype, pd.CategoricalDtype):
+            # Compact ratings: compare positions among the sorted meeting dates
+            positions = dates.cat.codes.to_numpy()
+            categories = dates.cat.categories
+            in_window = positions >= 0
+            if start is not None:
+                in_window &= positions >= categories.searchsorted(start, side="left")
+            if end is not None:
+                in_window &= positions < categories.searchsorted(end, side="right")
+        else:
+            in_window = np.ones(len(ratings), dtype=bool)
+            if start is not None:
+                in_window &= (dates >= start).to_numpy()
+            if end is not None:
+                in_window &= (dates <= end).to_numpy()
+        ratings = ratings[in_window]
+        aggregates = AggregateStore({"Member": batch_stats(ratings, "Member")})
+        total_books = ratings["Book"].nunique()
+
+    table = aggregates.tables["Member"]
+    spread = aggregates.summary("Member")
+    result = pd.DataFrame({
+        "Books Rated": table["count"],
+        "Attendance Rate": table["count"] / total_books,
+        "Avg Likeability Given": table["mean_like"],
+        "Avg Importance Given": table["mean_imp"],
+        "Std Likeability": spread["std_like"],
+        "Std Importance": spread["std_imp"],
+        "Min Likeability": table["min_like"],
+        "Max Likeability": table["max_like"],
+    })
+    result["Range Likeability"] = result["Max Likeability"] - result["Min Likeability"]
+
+    # Members in sheet order, skipping anyone with no ratings
+    order = [m for m in snapshot.members if m in result.index]
+    return result.reindex(order).rename_axis("Member").reset_index()
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+@instrumentation.cache_miss("calculations._deviation_table")
+def _deviation_table(version: str, _ratings: pd.DataFrame) -> pd.DataFrame:
+    """The ratings plus each rating's deviation from its book's group average.
+
+    Adds book_avg_<m>, dev_<m> (signed) and abs_dev_<m> for m in like / imp.
+    Built once per data version and shared, so callers must not modify it.
+    """
+    table = _ratings.copy()
+    by_book = _ratings.groupby("Book", observed=True)
+    for metric, suffix in (("Likeability", "like"), ("Importance", "imp")):
+        avg = by_book[metric].transform("mean")
+        table[f"book_avg_{suffix}"] = avg
+        table[f"dev_{suffix}"] = _ratings[metric] - avg
+        table[f"abs_dev_{suffix}"] = table[f"dev_{suffix}"].abs()
+    return table
+
+
+def _deviations() -> pd.DataFrame:
+    snapshot = get_snapshot()
+    return _deviation_table(snapshot.version, snapshot.ratings)
 
 
 def agreement_score() -> pd.DataFrame:
@@ -42,62 +120,113 @@ def agreement_score() -> pd.DataFrame:
 
     Lower = more agreeable with the group.
     """
-    ratings = get_ratings_long()
-    book_avgs = ratings.groupby("Book")["Likeability"].mean().rename("book_avg")
-    merged = ratings.merge(book_avgs, on="Book")
-    merged["deviation"] = (merged["Likeability"] - merged["book_avg"]).abs()
-
-    result = merged.groupby("Member")["deviation"].mean().reset_index()
+    dev = _deviations()
+    result = dev.groupby("Member", observed=True)["abs_dev_like"].mean().reset_index()
     result.columns = ["Member", "Avg Deviation"]
     return result.sort_values("Avg Deviation")
 
 
-def pairwise_correlation() -> pd.DataFrame:
-    """Pearson correlation between each member pair on shared books."""
-    matrix = get_member_book_matrix("Likeability")
-    members = matrix.index.tolist()
-    rows = []
-    for i, m1 in enumerate(members):
-        for j, m2 in enumerate(members):
-            if i >= j:
-                continue
-            shared = matrix.loc[[m1, m2]].dropna(axis=1)
-            if shared.shape[1] < 3:
-                continue
-            r, p = stats.pearsonr(shared.loc[m1], shared.loc[m2])
-            rows.append({
-                "Member 1": m1,
-                "Member 2": m2,
-                "Correlation": round(r, 3),
-                "P-value": round(p, 4),
-                "Shared Books": shared.shape[1],
-            })
-    return pd.DataFrame(rows).sort_values("Correlation", ascending=False)
+@st.cache_resource(max_entries=4, show_spinner=False)
+@instrumentation.cache_miss("calculations._permutation_pvalue_matrix")
+def _permutation_pvalue_matrix(version: str, _matrix: pd.DataFrame, n_permutations: int, seed: int) -> np.ndarray:
+    """(members x members) permutation p-values, upper triangle filled, once per version."""
+    x = _matrix.to_numpy().T
+    i, j = np.triu_indices(x.shape[1], k=1)
+    p = np.full((x.shape[1], x.shape[1]), np.nan)
+    p[i, j] = permutation_pvalues(x, i, j, n_permutations, seed)
+    return p
+
+
+def permutation_count(pairs: int, width: int) -> int:
+    """Shuffles for a permutation test over `pairs` pairs sharing up to `width` books."""
+    budget = PERMUTATION_CELLS // max(pairs * width, 1)
+    return int(min(PERMUTATIONS, max(MIN_PERMUTATIONS, budget)))
+
+
+def pairwise_correlation(p_values: str = "t", n_permutations: int | None = None, seed: int = 0) -> pd.DataFrame:
+    """Pearson correlation between each member pair on shared books.
+
+    `p_values` picks the significance test: "t" (pearsonr's t test) or
+    "permutation" -- exact over every ordering for pairs sharing up to 7
+    books, otherwise `n_permutations` seeded shuffles (default
+    permutation_count() for this club's size).
+    """
+    snapshot = get_snapshot()
+    matrix = snapshot.matrix("Likeability")
+    members = matrix.index.to_numpy()
+    r, n = pairwise_pearson(matrix.to_numpy().T)
+
+    i, j = np.triu_indices(len(members), k=1)
+    keep = n[i, j] >= 3
+    i, j = i[keep], j[keep]
+    corr, shared = r[i, j], n[i, j]
+    if p_values == "permutation":
+        if n_permutations is None:
+            n_permutations = permutation_count(len(i), int(shared.max(initial=0)))
+        p = _permutation_pvalue_matrix(snapshot.version, matrix, n_permutations, seed)[i, j]
+    elif p_values == "t":
+        p = pearson_pvalues(corr, shared)
+    else:
+        raise ValueError(f"Unknown p_values mode: {p_values!r}")
+    return pd.DataFrame({
+        "Member 1": members[i],
+        "Member 2": members[j],
+        "Correlation": np.round(corr, 3),
+        "P-value": np.round(p, 4),
+        "Shared Books": shared,
+    }).sort_values("Correlation", ascending=False)
 
 
 def taste_similarity_matrix() -> pd.DataFrame:
     """Full correlation matrix for clustering/heatmap."""
-    matrix = get_member_book_matrix("Likeability")
-    return matrix.T.corr()
+    matrix = get_snapshot().matrix("Likeability")
+    r, _ = pairwise_pearson(matrix.to_numpy().T)
+    return pd.DataFrame(r, index=matrix.index, columns=matrix.index)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+@instrumentation.cache_miss("calculations._hot_take_index")
+def _hot_take_index(version: str, _deviation: pd.DataFrame) -> ThresholdIndex:
+    """Likeability deviations ranked by size, per member and per book, once per version."""
+    takes = _deviation[["Book", "Member", "Likeability", "book_avg_like", "dev_like", "abs_dev_like"]]
+    return ThresholdIndex.build(takes.rename(columns=_LIKE_DEVIATION_COLUMNS), "abs_deviation", ("Member", "Book"))
+
+
+def _hot_takes() -> ThresholdIndex:
+    snapshot = get_snapshot()
+    return _hot_take_index(snapshot.version, _deviations())
 
 
 def hot_takes(threshold: float = 1.5) -> pd.DataFrame:
-    """Ratings deviating > threshold from group average."""
-    ratings = get_ratings_long()
-    book_avgs = ratings.groupby("Book")["Likeability"].mean().rename("book_avg")
-    merged = ratings.merge(book_avgs, on="Book")
-    merged["deviation"] = merged["Likeability"] - merged["book_avg"]
-    merged["abs_deviation"] = merged["deviation"].abs()
-
-    hot = merged[merged["abs_deviation"] > threshold].sort_values(
-        "abs_deviation", ascending=False
-    )
-    return hot[["Book", "Member", "Likeability", "book_avg", "deviation", "abs_deviation"]]
+    """Ratings deviating > threshold from group average, biggest first."""
+    return _hot_takes().above(threshold).copy()
+
+
+def hot_take_count(threshold: float = 1.5) -> int:
+    """How many ratings deviate > threshold from the group average."""
+    return _hot_takes().count_above(threshold)
+
+
+def top_hot_takes(
+    n: int = 10, member: str | None = None, book: str | None = None, threshold: float = 0.0
+) -> pd.DataFrame:
+    """The `n` biggest deviations > threshold, overall or for one member or book."""
+    index = _hot_takes()
+    if member is not None:
+        return index.top(n, "Member", member, threshold).copy()
+    if book is not None:
+        return index.top(n, "Book", book, threshold).copy()
+    return index.above(threshold).head(n).copy()
+
+
+def hot_takes_per_member(n: int = 3, threshold: float = 0.0) -> pd.DataFrame:
+    """Each member's `n` biggest deviations > threshold, biggest first overall."""
+    return _hot_takes().top_per_group(n, "Member", threshold).copy()
 
 
 def book_controversy() -> pd.DataFrame:
     """Standard deviation per book — higher = more polarizing."""
-    summary = get_book_summary()
+    summary = get_snapshot().summary
     return summary[["Book", "book_index", "std_like", "avg_like", "num_raters"]].sort_values(
         "std_like", ascending=False
     )
@@ -105,7 +234,7 @@ def book_controversy() -> pd.DataFrame:
 
 def proposer_performance() -> pd.DataFrame:
     """Average group rating for books each member proposed."""
-    summary = get_book_summary()
+    summary = get_snapshot().summary
     result = summary.groupby("Proposer").agg(
         books_proposed=("Book", "count"),
         avg_like=("avg_like", "mean"),
@@ -114,22 +243,96 @@ def proposer_performance() -> pd.DataFrame:
     return result.sort_values("avg_like", ascending=False)
 
 
+def _book_mean_samples(tensor, metric: str) -> tuple[pd.Index, np.ndarray]:
+    """Bootstrap samples of every rated book's mean `metric`.
+
+    Returns the books (sheet order) and a (resamples x books) array.
+    """
+    mask = tensor.mask
+    sizes = mask.sum(axis=1)
+    rated = sizes > 0
+    # Row-major over the (books x members) grid, so each book's ratings are contiguous
+    values = tensor.metric(metric)[mask]
+    samples = resample_means(values, sizes[rated], BOOTSTRAP_RESAMPLES, BOOTSTRAP_SEED)
+    return pd.Index(np.asarray(tensor.books)[rated], name="Book"), samples
+
+
+def _interval_table(keys: pd.Index, estimate: pd.Series, samples: np.ndarray, level: float, top: int) -> pd.DataFrame:
+    low, high = percentile_intervals(samples, level)
+    probs = rank_probabilities(samples, top, BOOTSTRAP_SEED)
+    table = pd.DataFrame({"avg": estimate.reindex(keys).to_numpy(), "ci_low": low, "ci_high": high}, index=keys)
+    for rank in range(probs.shape[1]):
+        table[f"P(#{rank + 1})"] = probs[:, rank]
+    table[f"P(Top {probs.shape[1]})"] = probs.sum(axis=1)
+    return table.sort_values("avg", ascending=False).reset_index()
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+@instrumentation.cache_miss("calculations._rank_interval_tables")
+def _rank_interval_tables(
+    version: str, _tensor, _summary: pd.DataFrame, metric: str, level: float, top: int
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Book and proposer interval tables, once per version and settings.
+
+    Both come from one set of book-mean samples, which is dropped once the
+    tables are built; only the small finished tables stay cached.
+    """
+    books, samples = _book_mean_samples(_tensor, metric)
+    column = "avg_like" if metric == "Likeability" else "avg_imp"
+    book_table = _interval_table(books, _summary.set_index("Book")[column], samples, level, top)
+
+    # A proposer's score is the mean of their books' averages
+    proposer = _summary.set_index("Book")["Proposer"].reindex(books)
+    codes, proposers = pd.factorize(proposer, sort=True)
+    known = codes >= 0
+    picks = np.bincount(codes[known], minlength=len(proposers))
+    # (books x proposers) averaging weights
+    weights = np.zeros((len(books), len(proposers)), dtype=np.float32)
+    weights[np.flatnonzero(known), codes[known]] = 1 / picks[codes[known]]
+
+    keys = pd.Index(proposers, name="Proposer")
+    perf = proposer_performance().set_index("Proposer")
+    proposer_table = _interval_table(keys, perf[column], samples @ weights, level, top)
+    proposer_table.insert(1, "books_proposed", picks[keys.get_indexer(proposer_table["Proposer"])])
+    return book_table, proposer_table
+
+
+def book_rank_intervals(metric: str = "Likeability", level: float = 0.95, top: int = 3) -> pd.DataFrame:
+    """Bootstrap confidence intervals and rank odds for every book's average.
+
+    Each book's raters are resampled with replacement. Columns: Book, avg,
+    ci_low, ci_high, P(#1) .. P(#top) -- the share of resamples in which the
+    book has the highest, second highest, ... average -- and P(Top <top>).
+    Books with one rater get a zero-width interval.
+    """
+    snapshot = get_snapshot()
+    return _rank_interval_tables(snapshot.version, snapshot.tensor, snapshot.summary, metric, level, top)[0].copy()
+
+
+def proposer_rank_intervals(metric: str = "Likeability", level: float = 0.95, top: int = 3) -> pd.DataFrame:
+    """Bootstrap intervals and rank odds for proposer_performance() averages.
+
+    A proposer's score is the mean of their books' averages, so each
+    resample averages the resampled book means over the books they picked.
+    Columns as book_rank_intervals(), keyed by Proposer, plus books_proposed.
+    """
+    snapshot = get_snapshot()
+    return _rank_interval_tables(snapshot.version, snapshot.tensor, snapshot.summary, metric, level, top)[1].copy()
+
+
 def proposer_bias() -> pd.DataFrame:
     """Do proposers rate their own picks higher than the group average?
 
     Returns per-proposer: their rating of own picks vs group avg of own picks.
     """
-    ratings = get_ratings_long()
-    own = ratings[ratings["Member"] == ratings["Proposer"]]
+    dev = _deviations()
+    own = dev[dev["Member"] == dev["Proposer"]]
     if own.empty:
         return pd.DataFrame()
 
-    book_avgs = ratings.groupby("Book")["Likeability"].mean().rename("book_avg")
-    own = own.merge(book_avgs, on="Book")
-
-    result = own.groupby("Member").agg(
+    result = own.groupby("Member", observed=True).agg(
         own_rating=("Likeability", "mean"),
-        group_avg=("book_avg", "mean"),
+        group_avg=("book_avg_like", "mean"),
         books=("Book", "count"),
     ).reset_index()
     result["bias"] = result["own_rating"] - result["group_avg"]
@@ -138,33 +341,52 @@ def proposer_bias() -> pd.DataFrame:
 
 def member_deviation_per_book() -> pd.DataFrame:
     """Per-member deviation from group average for each book."""
-    ratings = get_ratings_long()
-    book_avgs = ratings.groupby("Book")["Likeability"].mean().rename("book_avg")
-    merged = ratings.merge(book_avgs, on="Book")
-    merged["deviation"] = merged["Likeability"] - merged["book_avg"]
-    return merged
+    snapshot = get_snapshot()
+    dev = _deviations()
+    columns = [*snapshot.ratings.columns, "book_avg_like", "dev_like"]
+    return dev[columns].rename(columns=_LIKE_DEVIATION_COLUMNS)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+@instrumentation.cache_miss("calculations._trend_sums")
+def _trend_sums(version: str, _summary: pd.DataFrame) -> tuple[pd.DataFrame, PrefixSums]:
+    """Book summary in date order plus prefix sums of its averages, once per version."""
+    ordered = _summary.sort_values("Date")
+    return ordered, PrefixSums.build(ordered[["avg_like", "avg_imp"]].to_numpy())
 
 
-def rating_trends() -> pd.DataFrame:
-    """Group average ratings over time with rolling averages."""
-    summary = get_book_summary()
-    summary = summary.sort_values("Date")
-    summary["rolling_like_3"] = summary["avg_like"].rolling(3, min_periods=1).mean()
-    summary["rolling_imp_3"] = summary["avg_imp"].rolling(3, min_periods=1).mean()
-    return summary
+def rating_trends(window: int = 3, kind: str = "rolling") -> pd.DataFrame:
+    """Group average ratings over time with a moving average.
+
+    `kind` "rolling" adds rolling_like_<window> / rolling_imp_<window> over
+    the last `window` books; "expanding" adds expanding_like / _imp over all
+    books so far; "ewm" adds ewm_like / _imp with span `window`.
+    """
+    if window < 1:
+        raise ValueError(f"Trend window must be at least 1, got {window!r}")
+    snapshot = get_snapshot()
+    ordered, sums = _trend_sums(snapshot.version, snapshot.summary)
+    if kind == "rolling":
+        smoothed, columns = sums.rolling(window), [f"rolling_like_{window}", f"rolling_imp_{window}"]
+    elif kind == "expanding":
+        smoothed, columns = sums.expanding(), ["expanding_like", "expanding_imp"]
+    elif kind == "ewm":
+        smoothed, columns = sums.ewm(window), ["ewm_like", "ewm_imp"]
+    else:
+        raise ValueError(f"Unknown trend kind: {kind!r}")
+    trends = ordered.copy()
+    trends[columns] = smoothed
+    return trends
 
 
 def contrarian_index() -> pd.DataFrame:
     """Count how often each member deviates > 1 point from group avg."""
-    ratings = get_ratings_long()
-    book_avgs = ratings.groupby("Book")["Likeability"].mean().rename("book_avg")
-    merged = ratings.merge(book_avgs, on="Book")
-    merged["big_deviation"] = (merged["Likeability"] - merged["book_avg"]).abs() > 1.0
-
-    result = merged.groupby("Member").agg(
-        contrarian_count=("big_deviation", "sum"),
-        total_rated=("Book", "count"),
-    ).reset_index()
+    dev = _deviations()
+    big_deviation = (dev["abs_dev_like"] > 1.0).groupby(dev["Member"], observed=True)
+    result = pd.DataFrame({
+        "contrarian_count": big_deviation.sum(),
+        "total_rated": big_deviation.count(),
+    }).reset_index()
     result["contrarian_pct"] = result["contrarian_count"] / result["total_rated"]
     return result.sort_values("contrarian_pct", ascending=False)
 
@@ -174,21 +396,44 @@ def hivemind_index() -> pd.DataFrame:
     return agreement_score()  # Same calculation, lower = more hivemind
 
 
+@st.cache_resource(show_spinner=False)
+@instrumentation.cache_miss("calculations._genre_index")
+def _genre_index() -> GenreIndex:
+    """Genre index over the enrichment data, built once like get_enriched_books()."""
+    return GenreIndex.build(get_enriched_books())
+
+
 def genre_distribution() -> pd.DataFrame:
     """Genre counts from enrichment data."""
-    from utils.data_loader import get_enriched_books
-    enrichment = get_enriched_books()
-    genres = {}
-    for book_data in enrichment.values():
-        for genre in book_data.get("genres", []):
-            genres[genre] = genres.get(genre, 0) + 1
-    df = pd.DataFrame(list(genres.items()), columns=["Genre", "Count"])
+    counts = _genre_index().counts()
+    df = pd.DataFrame({"Genre": counts.index.to_numpy(), "Count": counts.to_numpy()})
     return df.sort_values("Count", ascending=False)
 
 
+def genre_ratings(metric: str = "Likeability") -> pd.DataFrame:
+    """Average club rating of the books in each genre.
+
+    Columns: Genre, Avg Rating (mean of the books' group averages), Books.
+    Only enriched books the club has rated count.
+    """
+    column = "avg_like" if metric == "Likeability" else "avg_imp"
+    summary = get_snapshot().summary.drop_duplicates("Book").set_index("Book")
+    averages = _genre_index().average(summary[column])
+    return pd.DataFrame({
+        "Genre": averages.index.to_numpy(),
+        "Avg Rating": averages["mean"].to_numpy(),
+        "Books": averages["books"].to_numpy(),
+    }).sort_values("Avg Rating", ascending=False)
+
+
+def member_genre_diversity() -> pd.Series:
+    """Number of distinct genres among the books each member rated."""
+    return _genre_index().coverage(attendance_matrix()).rename("Genres")
+
+
 def seasonal_ratings() -> pd.DataFrame:
     """Average ratings by month."""
-    summary = get_book_summary()
+    summary = get_snapshot().summary.copy()
     summary["Month"] = summary["Date"].dt.month
     summary["Month Name"] = summary["Date"].dt.strftime("%B")
     return summary.groupby(["Month", "Month Name"]).agg(
@@ -197,41 +442,140 @@ def seasonal_ratings() -> pd.DataFrame:
     ).reset_index().sort_values("Month")
 
 
+def _books_by_members(matrix: pd.DataFrame) -> pd.DataFrame:
+    """Book x Member ratings with gaps filled by the member's mean rating."""
+    bm = matrix.T
+    return bm.fillna(bm.mean())
+
+
 def cosine_similarity_books() -> pd.DataFrame:
     """Cosine similarity between books based on member ratings."""
-    matrix = get_member_book_matrix("Likeability")
-    # Transpose: books as rows, members as columns
-    bm = matrix.T
-    # Fill NaN with column mean for similarity calc
-    bm_filled = bm.apply(lambda col: col.fillna(col.mean()), axis=0)
-
-    from numpy.linalg import norm
-    books = bm_filled.index.tolist()
-    rows = []
-    for i, b1 in enumerate(books):
-        for j, b2 in enumerate(books):
-            if i >= j:
-                continue
-            v1 = bm_filled.loc[b1].values
-            v2 = bm_filled.loc[b2].values
-            n1, n2 = norm(v1), norm(v2)
-            if n1 == 0 or n2 == 0:
-                continue
-            sim = np.dot(v1, v2) / (n1 * n2)
-            rows.append({"Book 1": b1, "Book 2": b2, "Similarity": round(sim, 3)})
-    return pd.DataFrame(rows).sort_values("Similarity", ascending=False)
+    matrix = get_snapshot().matrix("Likeability")
+    bm_filled = _books_by_members(matrix)
+    sims, valid = cosine_matrix(bm_filled.to_numpy())
+
+    books = bm_filled.index.to_numpy()
+    i, j = np.triu_indices(len(books), k=1)
+    keep = valid[i] & valid[j]
+    i, j = i[keep], j[keep]
+    return pd.DataFrame({
+        "Book 1": books[i],
+        "Book 2": books[j],
+        "Similarity": np.round(sims[i, j], 3),
+    }).sort_values("Similarity", ascending=False)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+@instrumentation.cache_miss("calculations._book_similarity_index")
+def _book_similarity_index(version: str, _matrix: pd.DataFrame) -> tuple[pd.Index, TopKIndex]:
+    """Top-k cosine neighbours of every book, built once per data version."""
+    bm_filled = _books_by_members(_matrix)
+    return bm_filled.index, TopKIndex.build(bm_filled.to_numpy(), SIMILAR_BOOKS_K)
+
+
+def _similarity_index() -> tuple[pd.Index, TopKIndex]:
+    snapshot = get_snapshot()
+    return _book_similarity_index(snapshot.version, snapshot.matrix("Likeability"))
+
+
+def top_k_similar(book: str, k: int = 5) -> pd.DataFrame:
+    """The `k` books most similar to `book` (k <= SIMILAR_BOOKS_K)."""
+    books, index = _similarity_index()
+    if book not in books:
+        return pd.DataFrame({"Book": pd.Series(dtype=str), "Similarity": pd.Series(dtype=float)})
+    neighbors, scores = index.query(books.get_loc(book), k)
+    return pd.DataFrame({"Book": books[neighbors], "Similarity": np.round(scores, 3)})
+
+
+def most_similar_book_pairs(n: int = 5) -> pd.DataFrame:
+    """The `n` most similar book pairs (n <= SIMILAR_BOOKS_K), from the top-k index."""
+    books, index = _similarity_index()
+    i, j, scores = index.top_pairs(n)
+    return pd.DataFrame({"Book 1": books[i], "Book 2": books[j], "Similarity": np.round(scores, 3)})
+
+
+# Latest fit per metric, the warm start for the next data version's fit
+_last_rating_models: dict[str, Factorization] = {}
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+@instrumentation.cache_miss("calculations._rating_model")
+def _rating_model(version: str, _matrix: pd.DataFrame, metric: str) -> Factorization:
+    """ALS model of one metric's Member x Book matrix, fitted once per version."""
+    model = fit_als(
+        _matrix.to_numpy(dtype=float),
+        list(_matrix.index),
+        list(_matrix.columns),
+        rank=RATING_MODEL_RANK,
+        reg=RATING_MODEL_REG,
+        tol=1e-5,
+        init=_last_rating_models.get(metric),
+    )
+    _last_rating_models[metric] = model
+    return model
+
+
+def predicted_ratings(metric: str = "Likeability") -> pd.DataFrame:
+    """Member x Book model predictions for every cell, rated or not.
+
+    Same layout as get_member_book_matrix(); predictions are clipped to the
+    range of ratings actually given.
+    """
+    snapshot = get_snapshot()
+    matrix = snapshot.matrix(metric)
+    model = _rating_model(snapshot.version, matrix, metric)
+    values = matrix.to_numpy(dtype=float)
+    predicted = np.clip(model.predict(), np.nanmin(values), np.nanmax(values))
+    return pd.DataFrame(predicted, index=matrix.index, columns=matrix.columns)
+
+
+def prediction_vs_actual(member: str, metric: str = "Likeability") -> pd.DataFrame:
+    """One member's predicted and actual rating for every book.
+
+    Columns: Book, Actual (NaN where unrated), Predicted, Residual
+    (actual - predicted), Rated. Empty for a member with no ratings yet,
+    who has no row in the model.
+    """
+    matrix = get_snapshot().matrix(metric)
+    if member not in matrix.index:
+        return pd.DataFrame(columns=["Book", "Actual", "Predicted", "Residual", "Rated"])
+    actual = matrix.loc[member]
+    predicted = predicted_ratings(metric).loc[member]
+    return pd.DataFrame({
+        "Book": actual.index,
+        "Actual": actual.to_numpy(dtype=float),
+        "Predicted": predicted.to_numpy(),
+        "Residual": (actual - predicted).to_numpy(dtype=float),
+        "Rated": actual.notna().to_numpy(),
+    })
+
+
+def attendance_matrix() -> pd.DataFrame:
+    """Book x Member boolean matrix: True where the member rated the book.
+
+    Rows are the books with at least one rating, in sheet order; columns are
+    the members in header order. Read straight off the rating tensor's mask.
+    """
+    tensor = get_snapshot().tensor
+    rated_any = tensor.mask.any(axis=1)
+    return pd.DataFrame(
+        tensor.mask[rated_any],
+        index=pd.Index(np.array(tensor.books, dtype=object)[rated_any], name="Book"),
+        columns=pd.Index(tensor.members, name="Member"),
+    )
 
 
 def attendance_by_book() -> pd.DataFrame:
-    """Which members rated each book."""
-    ratings = get_ratings_long()
-    raw_data = get_book_summary()
-    book_order = raw_data.sort_values("book_index")["Book"].tolist()
-
-    result = []
-    for book in book_order:
-        book_ratings = ratings[ratings["Book"] == book]
-        for member in MEMBERS:
-            rated = member in book_ratings["Member"].values
-            result.append({"Book": book, "Member": member, "Rated": rated})
-    return pd.DataFrame(result)
+    """Which members rated each book, one row per (book, member) pair.
+
+    Long-form view of attendance_matrix(); prefer the matrix where possible.
+    """
+    matrix = attendance_matrix()
+    return pd.DataFrame({
+        "Book": np.repeat(matrix.index.to_numpy(), matrix.shape[1]),
+        "Member": np.tile(matrix.columns.to_numpy(), len(matrix)),
+        "Rated": matrix.to_numpy().ravel(),
+    })
+
+
+instrumentation.instrument_module(sys.modules[__name__])
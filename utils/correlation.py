@@ -0,0 +1,161 @@
+"""Pairwise-complete Pearson correlation over NaN-masked matrices.
+
+Every pair of columns is correlated over the rows where both are present,
+as pandas' DataFrame.corr() and a per-pair dropna() + scipy.stats.pearsonr
+would do, but for all pairs at once: the masked sums each pair needs are
+entries of a handful of (variables x variables) matrix products.
+
+permutation_pvalues() tests those correlations without the t test's
+normality assumption, by shuffling one column of each pair.
+"""
+
+import itertools
+
+import numpy as np
+from scipy import stats
+
+from utils.parallel import run_batches, split_batches
+
+# Variances this small relative to the sum of squares are rounding noise
+# around a constant column, which has no defined correlation
+_VAR_RTOL = 1e-10
+# Shuffled statistics within this of the observed one count as ties
+_STAT_ATOL = 1e-9
+# Shuffles per batch; batches are the unit of work handed to a process
+PERMUTATION_BATCH = 500
+# Upper bound on the (shuffles x pairs x shared rows) block built at once
+PERMUTATION_BLOCK_CELLS = 4_000_000
+
+
+def pairwise_pearson(x: np.ndarray, min_periods: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """Correlation and overlap counts between the columns of `x`.
+
+    `x` is (observations x variables) with NaN where a value is missing.
+    Returns (r, n), both (variables x variables): r[i, j] is Pearson's r of
+    columns i and j over the n[i, j] rows where both are present. r is NaN
+    for pairs with fewer than max(min_periods, 2) shared rows or with a
+    constant column over those rows.
+    """
+    present = ~np.isnan(x)
+    weights = present.astype(float)
+    counts = present.sum(axis=0)
+
+    # Center each column on its own mean first to keep the sums well conditioned
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, np.where(present, x, 0.0).sum(axis=0) / counts, 0.0)
+    x0 = np.where(present, x - means, 0.0)
+
+    n = weights.T @ weights
+    # s[i, j] / ss[i, j]: sum / sum of squares of column i over rows shared with j
+    s = x0.T @ weights
+    ss = (x0 * x0).T @ weights
+    sxy = x0.T @ x0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = ss - s * s / n
+        cov = sxy - s * s.T / n
+        r = cov / np.sqrt(var * var.T)
+
+    flat = var <= _VAR_RTOL * ss
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < max(min_periods, 2)) | flat | flat.T] = np.nan
+    return r, n.astype(np.int64)
+
+
+def pearson_pvalues(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values for Pearson r over n observations (t test, n - 2 df)."""
+    r = np.asarray(r, dtype=float)
+    dof = np.asarray(n, dtype=float) - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.abs(r) * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(t, dof)
+    return np.where(dof > 0, p, np.nan)
+
+
+def _paired_columns(x: np.ndarray, i: np.ndarray, j: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Centered values of column pairs (i, j) over their shared rows.
+
+    Returns (a, b, n): a and b are (pairs x max shared) with each pair's
+    shared rows packed first and zero padding after, n the shared counts.
+    """
+    both = ~np.isnan(x[:, i]) & ~np.isnan(x[:, j])
+    n = both.sum(axis=0)
+    width = int(n.max(initial=0))
+    # Stable sort puts each pair's shared rows first, in row order
+    order = np.argsort(~both, axis=0, kind="stable")[:width]
+    shared = np.take_along_axis(both, order, axis=0).T
+    a = np.where(shared, np.take_along_axis(x[:, i], order, axis=0).T, 0.0)
+    b = np.where(shared, np.take_along_axis(x[:, j], order, axis=0).T, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a = np.where(shared, a - (a.sum(axis=1) / n)[:, None], 0.0)
+        b = np.where(shared, b - (b.sum(axis=1) / n)[:, None], 0.0)
+    return a, b, n
+
+
+def _permutation_batch(a: np.ndarray, b: np.ndarray, n: np.ndarray, count: int, seed) -> np.ndarray:
+    """Per pair, how many of `count` random shuffles of b match or beat |a . b|."""
+    rng = np.random.default_rng(seed)
+    pairs, width = a.shape
+    padding = np.arange(width) >= n[:, None]
+    observed = np.abs(np.einsum("pl,pl->p", a, b)) - _STAT_ATOL
+    hits = np.zeros(pairs, dtype=np.int64)
+    block = max(1, PERMUTATION_BLOCK_CELLS // max(pairs * width, 1))
+    for lo in range(0, count, block):
+        size = min(block, count - lo)
+        # Random keys with padding sorted last shuffle only each pair's shared rows
+        keys = rng.random((size, pairs, width))
+        keys[:, padding] = 2.0
+        shuffled = np.take_along_axis(np.broadcast_to(b, keys.shape), np.argsort(keys, axis=2), axis=2)
+        hits += (np.abs(np.einsum("pl,spl->sp", a, shuffled)) >= observed).sum(axis=0)
+    return hits
+
+
+def _exact_pvalues(a: np.ndarray, b: np.ndarray, size: int) -> np.ndarray:
+    """Two-sided p-values over every ordering of `size` shared rows."""
+    a, b = a[:, :size], b[:, :size]
+    orders = np.array(list(itertools.permutations(range(size))))
+    observed = np.abs(np.einsum("pl,pl->p", a, b)) - _STAT_ATOL
+    hits = np.zeros(len(a), dtype=np.int64)
+    block = max(1, PERMUTATION_BLOCK_CELLS // orders.size)
+    for lo in range(0, len(a), block):
+        stats_ = np.abs(np.einsum("pl,pol->po", a[lo:lo + block], b[lo:lo + block][:, orders]))
+        hits[lo:lo + block] = (stats_ >= observed[lo:lo + block, None]).sum(axis=1)
+    return hits / len(orders)
+
+
+def permutation_pvalues(
+    x: np.ndarray,
+    i: np.ndarray,
+    j: np.ndarray,
+    n_permutations: int = 10_000,
+    seed: int = 0,
+    exact_max: int = 7,
+    workers: int | None = None,
+) -> np.ndarray:
+    """Two-sided permutation p-values for the correlation of column pairs (i, j).
+
+    For each pair, one column is shuffled over the rows both share, which
+    needs no normality assumption. Pairs sharing at most `exact_max` rows
+    are tested against every ordering (exact); the rest against
+    `n_permutations` random shuffles, all pairs at once, in seeded batches
+    (utils.parallel), with p = (hits + 1) / (n_permutations + 1). NaN for
+    pairs with fewer than 3 shared rows or a constant column.
+    """
+    a, b, n = _paired_columns(x, np.asarray(i), np.asarray(j))
+    p = np.full(len(n), np.nan)
+    flat = ((a * a).sum(axis=1) == 0) | ((b * b).sum(axis=1) == 0)
+    testable = (n >= 3) & ~flat
+
+    for size in range(3, exact_max + 1):
+        rows = np.flatnonzero(testable & (n == size))
+        if len(rows):
+            p[rows] = _exact_pvalues(a[rows], b[rows], size)
+
+    rows = np.flatnonzero(testable & (n > exact_max))
+    if len(rows) and n_permutations > 0:
+        a, b, n = a[rows], b[rows], n[rows]
+        batches = split_batches(n_permutations, PERMUTATION_BATCH, seed)
+        tasks = [(a, b, n, count, batch_seed) for count, batch_seed in batches]
+        hits = sum(run_batches(_permutation_batch, tasks, n_permutations * a.size, workers))
+        p[rows] = (hits + 1) / (n_permutations + 1)
+    return p
@@ -1,16 +1,50 @@
 """Load and transform DBC data from CSV and enrichment JSON."""
 
+import hashlib
+import io
 import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-DATA_DIR = Path(__file__).parent.parent / "data"
+from utils import cache, enrichment_store, instrumentation, remote_sheet
+from utils.aggregates import DIMENSIONS, AggregateStore, batch_stats, frame_name
+from utils.tensor import RatingsTensor, build_values
+
+# DBC_DATA_DIR points at another sheet + enrichment pair (see utils.cache)
+DATA_DIR = cache.DATA_DIR
 CSV_PATH = DATA_DIR / "DrunkBookClub - Sheet1.csv"
 ENRICHMENT_PATH = DATA_DIR / "book_enrichment.json"
 
-MEMBERS = ["Willy", "Bartel", "Josh", "Faulkner", "Ryan", "John", "Christian"]
+# Bump whenever the shape or dtypes of the cached frames change
+SCHEMA_VERSION = 4
+
+# Serve get_ratings_long() in the compact layout (see compact_ratings)
+COMPACT_RATINGS = os.environ.get("DBC_COMPACT_RATINGS", "") == "1"
+
+# "sqlite" answers get_book_ratings/get_member_ratings from utils.sqlite_store
+RATINGS_BACKEND = os.environ.get("DBC_RATINGS_BACKEND", "pandas")
+
+# Published CSV export of the canonical sheet; when set it replaces CSV_PATH
+SHEET_URL = os.environ.get("DBC_SHEET_URL", "")
+SHEET_POLL_SECONDS = float(os.environ.get("DBC_SHEET_POLL_SECONDS", "60"))
+REMOTE_CSV_PATH = cache.CACHE_DIR / "remote_sheet.csv"
+
+METRICS = ("Likeability", "Importance")
+FRAME_NAMES = ("raw", "ratings", "summary", *(frame_name(dim) for dim in DIMENSIONS))
+TENSOR_NAME = "ratings_tensor"
+
+# Per-member rating columns look like "Willy - Likeability"
+RATING_COLUMN = re.compile(r"^(?P<member>.+) - (?P<metric>Likeability|Importance)$")
 
 # Nickname mapping for the Proposer column
 PROPOSER_NICKNAMES = {
@@ -19,75 +53,120 @@ PROPOSER_NICKNAMES = {
 }
 
 
-@st.cache_data
-def load_raw_data() -> pd.DataFrame:
-    """Load the raw CSV and clean it up."""
-    df = pd.read_csv(CSV_PATH)
+def clean_raw_data(df: pd.DataFrame, first_index: int = 1) -> pd.DataFrame:
+    """Clean freshly parsed CSV rows, numbering books from `first_index`."""
     df["Date"] = pd.to_datetime(df["Date"], format="%m/%d/%Y")
     df["Proposer"] = df["Proposer"].replace(PROPOSER_NICKNAMES)
     df["Book"] = df["Book"].str.strip()
-    df["book_index"] = range(1, len(df) + 1)
+    df["book_index"] = range(first_index, first_index + len(df))
     return df
 
 
-@st.cache_data
-def load_enrichment() -> dict:
-    """Load book enrichment JSON metadata."""
-    if ENRICHMENT_PATH.exists():
-        with open(ENRICHMENT_PATH) as f:
-            return json.load(f)
-    return {}
+def parse_raw_data(path: Path = CSV_PATH) -> pd.DataFrame:
+    """Parse the raw CSV and clean it up."""
+    return clean_raw_data(pd.read_csv(path))
 
 
-@st.cache_data
-def get_ratings_long() -> pd.DataFrame:
-    """Transform wide-format CSV into long-format ratings DataFrame.
+@lru_cache(maxsize=16)
+def compile_columns(columns: tuple[str, ...]) -> dict[str, tuple[int, int]]:
+    """Map each member in a sheet header to its rating column positions.
 
-    Returns DataFrame with columns:
-        Book, Date, Proposer, book_index, Member, Likeability, Importance
-    One row per member-book rating (only where ratings exist).
+    Members are discovered from "<Member> - Likeability" / "<Member> -
+    Importance" column pairs, in header order; a member needs both columns.
+    Returns {member: (likeability_position, importance_position)}.
     """
-    df = load_raw_data()
-    rows = []
-    for _, book_row in df.iterrows():
-        for member in MEMBERS:
-            like_col = f"{member} - Likeability"
-            imp_col = f"{member} - Importance"
-            if like_col in df.columns and imp_col in df.columns:
-                like_val = book_row.get(like_col)
-                imp_val = book_row.get(imp_col)
-                # Skip if both are missing
-                if pd.notna(like_val) and pd.notna(imp_val):
-                    rows.append({
-                        "Book": book_row["Book"],
-                        "Date": book_row["Date"],
-                        "Proposer": book_row["Proposer"],
-                        "book_index": book_row["book_index"],
-                        "Member": member,
-                        "Likeability": float(like_val),
-                        "Importance": float(imp_val),
-                    })
-    return pd.DataFrame(rows)
+    positions: dict[str, dict[str, int]] = {}
+    for i, col in enumerate(columns):
+        match = RATING_COLUMN.match(col)
+        if match:
+            positions.setdefault(match["member"], {})[match["metric"]] = i
+    return {
+        member: (cols["Likeability"], cols["Importance"])
+        for member, cols in positions.items()
+        if len(cols) == len(METRICS)
+    }
 
 
-@st.cache_data
-def get_book_summary() -> pd.DataFrame:
-    """Get per-book summary stats.
+def read_members(path: Path = CSV_PATH) -> list[str]:
+    """Members found in a CSV header, without parsing any rows."""
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+    except (OSError, ValueError):
+        return []
+    return list(compile_columns(tuple(header)))
 
-    Returns DataFrame with columns:
-        Book, Date, Proposer, book_index, Avg Likeability, Avg Importance,
-        Std Likeability, Num Raters
+
+def ratings_block(df: pd.DataFrame) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Members plus (books x members) Likeability and Importance arrays.
+
+    The header is compiled into a member column map and the whole ratings
+    block is pulled out as one 2-D float array.
     """
-    ratings = get_ratings_long()
-    raw = load_raw_data()
+    column_map = compile_columns(tuple(df.columns))
+    members = list(column_map)
+    if not members:
+        empty = np.empty((len(df), 0))
+        return members, empty, empty
+    like_pos, imp_pos = zip(*column_map.values())
+    block = df.iloc[:, list(like_pos) + list(imp_pos)].to_numpy(dtype=float)
+    return members, block[:, : len(members)], block[:, len(members):]
+
+
+def melt_ratings(df: pd.DataFrame) -> pd.DataFrame:
+    """Reshape the wide per-member rating columns into one row per rating.
+
+    A rating is kept only when both values are present. Rows come out in
+    sheet order, then member order.
+    """
+    members, like, imp = ratings_block(df)
+    meta_cols = ["Book", "Date", "Proposer", "book_index"]
+    if not members:
+        return pd.DataFrame(columns=meta_cols + ["Member", "Likeability", "Importance"])
+    members = np.array(members, dtype=object)
+
+    # nonzero() walks the mask row-major: sheet order, then member order
+    rows, cols = np.nonzero(~np.isnan(like) & ~np.isnan(imp))
+    long = df[meta_cols].iloc[rows].reset_index(drop=True)
+    long["Member"] = members[cols]
+    long["Likeability"] = like[rows, cols]
+    long["Importance"] = imp[rows, cols]
+    return long
+
 
-    summary = ratings.groupby("Book").agg(
-        avg_like=("Likeability", "mean"),
-        avg_imp=("Importance", "mean"),
-        std_like=("Likeability", "std"),
-        std_imp=("Importance", "std"),
-        num_raters=("Member", "count"),
-    ).reset_index()
+def compact_ratings(ratings: pd.DataFrame) -> pd.DataFrame:
+    """Re-encode long ratings with small dtypes, same columns and values.
+
+    Book, Member and Proposer become categoricals (integer codes into a
+    lookup table); Member and Proposer share one table so they can still be
+    compared row-wise. Ratings become float32 with NaN as the missing
+    sentinel, book_index becomes int32, and Date becomes an ordered
+    categorical over the distinct meeting dates, which keeps min/max,
+    sorting and the .dt accessor working.
+    """
+    books = ratings.drop_duplicates("Book").sort_values("book_index")["Book"]
+    names = pd.CategoricalDtype(sorted(set(ratings["Member"]) | set(ratings["Proposer"])))
+    dates = pd.CategoricalDtype(pd.DatetimeIndex(ratings["Date"].unique()).sort_values(), ordered=True)
+    return pd.DataFrame({
+        "Book": pd.Categorical(ratings["Book"], categories=books),
+        "Date": ratings["Date"].astype(dates),
+        "Proposer": ratings["Proposer"].astype(names),
+        "book_index": ratings["book_index"].astype(np.int32),
+        "Member": ratings["Member"].astype(names),
+        "Likeability": ratings["Likeability"].astype(np.float32),
+        "Importance": ratings["Importance"].astype(np.float32),
+    })
+
+
+def summarize_books(
+    ratings: pd.DataFrame, raw: pd.DataFrame, aggregates: AggregateStore | None = None
+) -> pd.DataFrame:
+    """Per-book summary stats from long ratings plus the raw book metadata.
+
+    Pass `aggregates` when they already cover `ratings` to skip the grouping.
+    """
+    if aggregates is None:
+        aggregates = AggregateStore({"Book": batch_stats(ratings, "Book")})
+    summary = aggregates.summary("Book").reset_index()
 
     # Merge back book metadata
     meta = raw[["Book", "Date", "Proposer", "book_index"]].drop_duplicates()
@@ -99,49 +178,312 @@ def get_book_summary() -> pd.DataFrame:
     return summary
 
 
-@st.cache_data
+def _cache_key(digest: str) -> str:
+    """Cache key for a CSV digest under the current loader schema."""
+    return f"v{SCHEMA_VERSION}-{digest[:16]}"
+
+
+def ratings_tensor(df: pd.DataFrame) -> np.ndarray:
+    """(books x members x metrics) float64 tensor of a parsed sheet."""
+    _, like, imp = ratings_block(df)
+    return build_values(like, imp)
+
+
+def _derive_frames(raw: pd.DataFrame) -> tuple[dict[str, pd.DataFrame], np.ndarray]:
+    """Derive every persisted frame, plus the ratings tensor, from a parsed sheet."""
+    ratings = melt_ratings(raw)
+    aggregates = AggregateStore.from_ratings(ratings)
+    frames = {
+        "raw": raw,
+        "ratings": ratings,
+        "summary": summarize_books(ratings, raw, aggregates),
+        **aggregates.to_frames(),
+    }
+    return frames, ratings_tensor(raw)
+
+
+def _append_frames(data: bytes) -> tuple[dict[str, pd.DataFrame], np.ndarray] | None:
+    """Extend the last ingested frames with rows appended to the sheet.
+
+    The previous cache entry records the byte size, digest and last
+    book_index of the CSV it was built from. If the current file still
+    starts with exactly those bytes, only the rows after them are parsed and
+    folded into the cached frames. Returns None when anything other than a
+    clean append happened (rows edited or removed, a re-read title, a schema
+    bump), in which case the caller rebuilds from scratch.
+    """
+    previous = cache.latest_entry(prefix=f"v{SCHEMA_VERSION}-")
+    if previous is None:
+        return None
+    prev_key, manifest = previous
+    size = manifest.get("size")
+    if size is None or len(data) <= size or hashlib.sha256(data[:size]).hexdigest() != manifest["digest"]:
+        return None
+    tail = data[size:]
+    # Text added to the old last line is an edit, not a new row
+    if not data[:size].endswith(b"\n") and not tail.startswith((b"\n", b"\r\n")):
+        return None
+
+    prev = {name: cache.read_frame(prev_key, name) for name in FRAME_NAMES}
+    prev_tensor = cache.read_array(prev_key, TENSOR_NAME)
+    if prev_tensor is None or any(frame is None for frame in prev.values()):
+        return None
+
+    header = data[: data.index(b"\n") + 1]
+    delta = clean_raw_data(
+        pd.read_csv(io.BytesIO(header + tail)),
+        first_index=manifest["last_book_index"] + 1,
+    )
+    if delta["Book"].isin(prev["raw"]["Book"]).any():
+        return None
+
+    raw = pd.concat([prev["raw"], delta], ignore_index=True)
+    delta_ratings = melt_ratings(delta)
+    ratings = pd.concat([prev["ratings"], delta_ratings], ignore_index=True)
+    # Fold only the new ratings into the running per-book/member/proposer stats
+    aggregates = AggregateStore.from_frames(prev).update(delta_ratings)
+    frames = {
+        "raw": raw,
+        "ratings": ratings,
+        "summary": summarize_books(ratings, raw, aggregates),
+        **aggregates.to_frames(),
+    }
+    # New books only add rows along the sheet-order axis
+    tensor = np.concatenate([prev_tensor, ratings_tensor(delta)])
+    return frames, tensor
+
+
+def _ingest(data: bytes) -> tuple[dict[str, pd.DataFrame], np.ndarray]:
+    """Build all persisted frames and the ratings tensor for the given CSV bytes."""
+    built = _append_frames(data)
+    if built is None:
+        built = _derive_frames(clean_raw_data(pd.read_csv(io.BytesIO(data))))
+    return built
+
+
+_poll_lock = threading.Lock()
+_last_poll = 0.0
+
+
+def source_path() -> Path:
+    """The CSV the loader reads: the remote mirror if configured, else CSV_PATH."""
+    return REMOTE_CSV_PATH if SHEET_URL else CSV_PATH
+
+
+def refresh_source() -> None:
+    """Poll the remote sheet, at most once per SHEET_POLL_SECONDS.
+
+    An unchanged sheet answers 304 and leaves the mirror untouched, so the
+    data version stays the same and nothing is re-parsed.
+    """
+    global _last_poll
+    if not SHEET_URL:
+        return
+    with _poll_lock:
+        now = time.monotonic()
+        if REMOTE_CSV_PATH.exists() and now - _last_poll < SHEET_POLL_SECONDS:
+            return
+        _last_poll = now
+        remote_sheet.sync_sheet(SHEET_URL, REMOTE_CSV_PATH)
+
+
+@lru_cache(maxsize=8)
+def _file_digest(path: Path, mtime_ns: int, size: int) -> str:
+    """SHA-256 of a file, memoized on its stat so reruns skip the hashing."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def data_version() -> str:
+    """Version key of the current sheet: loader schema plus content hash."""
+    refresh_source()
+    path = source_path()
+    stat = path.stat()
+    return _cache_key(_file_digest(path, stat.st_mtime_ns, stat.st_size))
+
+
+def _load_frames(version: str) -> tuple[dict[str, pd.DataFrame], np.ndarray]:
+    """Read a version's frames and memory-mapped tensor, ingesting on a miss."""
+    frames = {name: cache.read_frame(version, name) for name in FRAME_NAMES}
+    tensor = cache.read_array(version, TENSOR_NAME, mmap_mode="r")
+    hit = tensor is not None and all(frame is not None for frame in frames.values())
+    instrumentation.cache_event("disk cache (parquet)", hit)
+    if hit:
+        return frames, tensor
+
+    data = source_path().read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    frames, tensor = _ingest(data)
+    manifest = {
+        "digest": digest,
+        "size": len(data),
+        "last_book_index": int(frames["raw"]["book_index"].max()) if len(frames["raw"]) else 0,
+    }
+    key = _cache_key(digest)
+    cache.write_frames(key, frames, manifest, arrays={TENSOR_NAME: tensor})
+    # Serve the shared mapping rather than this process's private copy
+    mapped = cache.read_array(key, TENSOR_NAME, mmap_mode="r")
+    return frames, tensor if mapped is None else mapped
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """Every frame and name index derived from one version of the sheet.
+
+    Snapshots are shared between sessions, so treat the frames as
+    read-only; the get_* accessors below hand out copies for callers that
+    add columns.
+    """
+
+    version: str
+    raw: pd.DataFrame
+    ratings: pd.DataFrame
+    summary: pd.DataFrame
+    tensor: RatingsTensor
+    aggregates: AggregateStore
+    books: list[str]
+    proposers: list[str]
+    members: list[str]
+
+    @cached_property
+    def matrices(self) -> dict[str, pd.DataFrame]:
+        """Member x Book matrix per metric, sliced from the tensor."""
+        return {metric: self.tensor.member_book_matrix(metric) for metric in METRICS}
+
+    def matrix(self, metric: str = "Likeability") -> pd.DataFrame:
+        """Member x Book matrix for a metric."""
+        return self.matrices[metric]
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+@instrumentation.cache_miss("data_loader.get_snapshot")
+def _build_snapshot(version: str) -> DataSnapshot:
+    frames, values = _load_frames(version)
+    raw = frames["raw"]
+    ratings = frames["ratings"]
+    if COMPACT_RATINGS:
+        ratings = compact_ratings(ratings)
+    members = list(compile_columns(tuple(raw.columns)))
+    tensor = RatingsTensor(
+        values=values,
+        books=raw["Book"].tolist(),
+        dates=raw["Date"].to_numpy(),
+        members=members,
+        metrics=METRICS,
+    )
+    return DataSnapshot(
+        version=version,
+        raw=raw,
+        ratings=ratings,
+        summary=frames["summary"],
+        tensor=tensor,
+        aggregates=AggregateStore.from_frames(frames),
+        books=raw.sort_values("Date")["Book"].tolist(),
+        proposers=sorted(raw["Proposer"].unique().tolist()),
+        members=members,
+    )
+
+
+def get_snapshot() -> DataSnapshot:
+    """The snapshot for the current sheet, built once per data version."""
+    return _build_snapshot(data_version())
+
+
+def load_raw_data() -> pd.DataFrame:
+    """Load the raw CSV and clean it up."""
+    return get_snapshot().raw.copy()
+
+
+def get_ratings_long() -> pd.DataFrame:
+    """Transform wide-format CSV into long-format ratings DataFrame.
+
+    Returns DataFrame with columns:
+        Book, Date, Proposer, book_index, Member, Likeability, Importance
+    One row per member-book rating (only where ratings exist).
+    With DBC_COMPACT_RATINGS=1 the frame uses the compact_ratings() layout.
+    """
+    return get_snapshot().ratings.copy()
+
+
+def get_book_summary() -> pd.DataFrame:
+    """Get per-book summary stats.
+
+    Returns DataFrame with columns:
+        Book, Date, Proposer, book_index, Avg Likeability, Avg Importance,
+        Std Likeability, Num Raters
+    """
+    return get_snapshot().summary.copy()
+
+
 def get_member_book_matrix(metric: str = "Likeability") -> pd.DataFrame:
     """Get a Member x Book matrix for the given metric.
 
     Returns a pivot table with members as rows, books as columns (in chronological order).
     Missing ratings are NaN.
     """
-    ratings = get_ratings_long()
-    raw = load_raw_data()
-    book_order = raw.sort_values("Date")["Book"].tolist()
-
-    matrix = ratings.pivot_table(
-        index="Member",
-        columns="Book",
-        values=metric,
-        aggfunc="first",
-    )
-    # Reorder columns chronologically
-    matrix = matrix[[b for b in book_order if b in matrix.columns]]
-    return matrix
+    return get_snapshot().matrix(metric).copy()
+
+
+def get_all_books() -> list[str]:
+    """Get list of all book names in chronological order."""
+    return list(get_snapshot().books)
+
+
+def get_all_proposers() -> list[str]:
+    """Get unique proposers."""
+    return list(get_snapshot().proposers)
+
+
+def get_members() -> list[str]:
+    """Get members with rating columns in the sheet, in header order."""
+    return list(get_snapshot().members)
+
+
+def get_book_ratings(book: str) -> pd.DataFrame:
+    """Long-format ratings for a single book, in member order."""
+    snapshot = get_snapshot()
+    if RATINGS_BACKEND == "sqlite":
+        from utils import sqlite_store
+        sqlite_store.sync(snapshot)
+        return sqlite_store.book_ratings(book)
+    ratings = snapshot.ratings
+    return ratings[ratings["Book"] == book].copy()
+
+
+def get_member_ratings(member: str) -> pd.DataFrame:
+    """Long-format ratings given by a single member, in book order."""
+    snapshot = get_snapshot()
+    if RATINGS_BACKEND == "sqlite":
+        from utils import sqlite_store
+        sqlite_store.sync(snapshot)
+        return sqlite_store.member_ratings(member)
+    ratings = snapshot.ratings
+    return ratings[ratings["Member"] == member].copy()
 
 
 @st.cache_data
+@instrumentation.cache_miss("data_loader.load_enrichment")
+def load_enrichment() -> dict:
+    """Load book enrichment JSON metadata."""
+    if ENRICHMENT_PATH.exists():
+        with open(ENRICHMENT_PATH) as f:
+            return json.load(f)
+    return {}
+
+
+@st.cache_data
+@instrumentation.cache_miss("data_loader.get_enriched_books")
 def get_enriched_books() -> dict:
     """Get enrichment data merged with book keys matching CSV names."""
     return load_enrichment()
 
 
 def get_book_enrichment(book_name: str) -> dict:
-    """Get enrichment data for a specific book."""
-    enrichment = get_enriched_books()
-    return enrichment.get(book_name, {})
+    """Get enrichment data for a specific book.
 
-
-@st.cache_data
-def get_all_books() -> list[str]:
-    """Get list of all book names in chronological order."""
-    df = load_raw_data()
-    return df.sort_values("Date")["Book"].tolist()
+    Reads only that book's record from the indexed enrichment store rather
+    than the whole JSON file.
+    """
+    return enrichment_store.get_record(ENRICHMENT_PATH, book_name)
 
 
-@st.cache_data
-def get_all_proposers() -> list[str]:
-    """Get unique proposers."""
-    df = load_raw_data()
-    return sorted(df["Proposer"].unique().tolist())
+instrumentation.instrument_module(sys.modules[__name__])
@@ -0,0 +1,97 @@
+"""Indexed enrichment store with per-book reads.
+
+book_enrichment.json is rewritten once per change into a JSONL file (one
+book per line) plus an index of byte offsets, both in the cache directory.
+Looking up a book then seeks to its line and parses only that record, and a
+small LRU keeps the hot records in memory. The index is keyed on the source
+file's size and mtime, so editing the JSON rebuilds it on the next read.
+"""
+
+import copy
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from utils import cache
+
+STORE_PATH = cache.CACHE_DIR / "enrichment.jsonl"
+INDEX_PATH = cache.CACHE_DIR / "enrichment.index.json"
+HOT_RECORDS = 64
+
+_lock = threading.Lock()
+_index: dict | None = None
+
+
+def _source_stamp(source: Path) -> list[int] | None:
+    try:
+        stat = source.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_index() -> dict | None:
+    try:
+        with open(INDEX_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build(source: Path, stamp: list[int]) -> dict:
+    """Rewrite `source` as JSONL plus a {book: [offset, length]} index."""
+    with open(source) as f:
+        enrichment = json.load(f)
+
+    lines, offsets, pos = [], {}, 0
+    for book, record in enrichment.items():
+        line = json.dumps(record, ensure_ascii=False).encode() + b"\n"
+        offsets[book] = [pos, len(line)]
+        lines.append(line)
+        pos += len(line)
+
+    index = {"source": stamp, "offsets": offsets}
+    STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    cache.write_atomic(STORE_PATH, b"".join(lines))
+    cache.write_atomic(INDEX_PATH, json.dumps(index).encode())
+    return index
+
+
+def _current_index(source: Path) -> dict | None:
+    """Index matching the source file, rebuilding it when the source changed."""
+    global _index
+    stamp = _source_stamp(source)
+    if stamp is None:
+        return None
+    if _index is not None and _index["source"] == stamp:
+        return _index
+    with _lock:
+        if _index is None or _index["source"] != stamp:
+            index = _read_index()
+            if index is None or index.get("source") != stamp or not STORE_PATH.exists():
+                index = build(source, stamp)
+            _index = index
+        return _index
+
+
+@lru_cache(maxsize=HOT_RECORDS)
+def _read_record(stamp: tuple[int, int], offset: int, length: int) -> dict:
+    with open(STORE_PATH, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def get_record(source: Path, book: str) -> dict:
+    """Enrichment for one book, or {} when the book has none."""
+    index = _current_index(source)
+    if index is None or book not in index["offsets"]:
+        return {}
+    offset, length = index["offsets"][book]
+    return copy.deepcopy(_read_record(tuple(index["source"]), offset, length))
+
+
+def books(source: Path) -> list[str]:
+    """Every enriched book title, without reading any records."""
+    index = _current_index(source)
+    return list(index["offsets"]) if index else []
@@ -0,0 +1,139 @@
+"""Low-rank matrix factorization of a sparse ratings matrix (biased ALS).
+
+A rating is modelled as
+
+    r[m, b] ~ mean + member_bias[m] + book_bias[b] + member_factors[m] . book_factors[b]
+
+and fitted to the observed cells by alternating ridge regressions: with the
+book side fixed, every member's (factors, bias) is an independent
+regularized least-squares problem, and vice versa. All members (or books)
+are solved in one batched np.linalg.solve over stacked normal equations, so
+an iteration is a few matrix products however large the club.
+
+A fit can warm-start from a previous one: rows and columns are matched by
+name and only new ones start from scratch, so adding a meeting to a fitted
+history converges in a few iterations.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Factorization:
+    """Fitted parameters; rows are members, columns books, both by position."""
+
+    members: list[str]
+    books: list[str]
+    mean: float
+    member_bias: np.ndarray
+    book_bias: np.ndarray
+    member_factors: np.ndarray
+    book_factors: np.ndarray
+    iterations: int
+
+    @property
+    def rank(self) -> int:
+        return self.member_factors.shape[1]
+
+    def predict(self) -> np.ndarray:
+        """(members x books) predicted rating for every cell."""
+        return (
+            self.mean
+            + self.member_bias[:, None]
+            + self.book_bias[None, :]
+            + self.member_factors @ self.book_factors.T
+        )
+
+
+def _solve_side(residual: np.ndarray, mask: np.ndarray, other: np.ndarray, reg: float) -> tuple[np.ndarray, np.ndarray]:
+    """Ridge-solve (factors, bias) for every row given the other side's factors.
+
+    `residual` is the rating minus everything the other side explains, zero
+    where `mask` is False.
+    """
+    rows, cols = mask.shape
+    rank = other.shape[1]
+    # Design per observed cell: the other side's factors plus a bias column
+    design = np.hstack([other, np.ones((cols, 1))])
+    width = rank + 1
+    outer = (design[:, :, None] * design[:, None, :]).reshape(cols, width * width)
+    gram = (mask.astype(float) @ outer).reshape(rows, width, width)
+    gram += reg * np.eye(width)
+    rhs = residual @ design
+    solution = np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+    return solution[:, :rank], solution[:, rank]
+
+
+def _align(previous: np.ndarray, old_names: list[str], new_names: list[str], fill) -> np.ndarray:
+    """Rows of `previous` reordered to `new_names`; unknown names get `fill` rows."""
+    position = {name: i for i, name in enumerate(old_names)}
+    aligned = np.array([fill(name) for name in new_names]) if new_names else previous[:0].copy()
+    for i, name in enumerate(new_names):
+        if name in position:
+            aligned[i] = previous[position[name]]
+    return aligned
+
+
+def fit_als(
+    ratings: np.ndarray,
+    members: list[str],
+    books: list[str],
+    rank: int = 2,
+    reg: float = 1.0,
+    max_iterations: int = 100,
+    tol: float = 1e-6,
+    seed: int = 0,
+    init: Factorization | None = None,
+) -> Factorization:
+    """Fit a biased low-rank model to the non-NaN cells of `ratings`.
+
+    `ratings` is (members x books). Iterates until the largest parameter
+    change falls below `tol` or `max_iterations` is reached. With `init`,
+    members and books already in it start from its parameters.
+    """
+    mask = ~np.isnan(ratings)
+    n_members, n_books = ratings.shape
+    mean = float(ratings[mask].mean()) if mask.any() else 0.0
+    centered = np.where(mask, ratings - mean, 0.0)
+
+    rng = np.random.default_rng(seed)
+
+    def start(_):
+        return rng.normal(0, 0.1, rank)
+
+    if init is not None and init.rank == rank:
+        member_factors = _align(init.member_factors, init.members, members, start)
+        book_factors = _align(init.book_factors, init.books, books, start)
+        member_bias = _align(init.member_bias, init.members, members, lambda _: 0.0)
+        book_bias = _align(init.book_bias, init.books, books, lambda _: 0.0)
+    else:
+        member_factors = rng.normal(0, 0.1, (n_members, rank))
+        book_factors = rng.normal(0, 0.1, (n_books, rank))
+        member_bias = np.zeros(n_members)
+        book_bias = np.zeros(n_books)
+
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        before = np.concatenate([member_factors.ravel(), book_factors.ravel(), member_bias, book_bias])
+
+        residual = np.where(mask, centered - book_bias[None, :], 0.0)
+        member_factors, member_bias = _solve_side(residual, mask, book_factors, reg)
+        residual = np.where(mask, centered - member_bias[:, None], 0.0).T
+        book_factors, book_bias = _solve_side(residual, mask.T, member_factors, reg)
+
+        after = np.concatenate([member_factors.ravel(), book_factors.ravel(), member_bias, book_bias])
+        if np.max(np.abs(after - before), initial=0.0) < tol:
+            break
+
+    return Factorization(
+        members=list(members),
+        books=list(books),
+        mean=mean,
+        member_bias=member_bias,
+        book_bias=book_bias,
+        member_factors=member_factors,
+        book_factors=book_factors,
+        iterations=iteration,
+    )
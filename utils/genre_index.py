@@ -0,0 +1,81 @@
+"""Inverted genre index over the book enrichment data.
+
+Books and genres are numbered once; `incidence` is the sparse (books x
+genres) 0/1 matrix of which book carries which genre, and its CSC form gives
+each genre's book ids directly. Genre counts, per-genre averages of any book
+score and per-member genre coverage are then sparse matrix products instead
+of loops over the enrichment records.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+@dataclass(frozen=True)
+class GenreIndex:
+    """Books (rows) and genres (columns, in first-seen order) plus their incidence."""
+
+    books: pd.Index
+    genres: pd.Index
+    incidence: sparse.csc_matrix
+
+    @classmethod
+    def build(cls, enrichment: dict) -> "GenreIndex":
+        """Index the "genres" lists of an enrichment dict (book -> record).
+
+        A genre listed twice for one book counts once.
+        """
+        books = pd.Index(list(enrichment), name="Book")
+        genre_ids: dict[str, int] = {}
+        rows, cols = [], []
+        for row, record in enumerate(enrichment.values()):
+            for genre in record.get("genres", []):
+                rows.append(row)
+                cols.append(genre_ids.setdefault(genre, len(genre_ids)))
+        incidence = sparse.csc_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(books), len(genre_ids))
+        )
+        incidence.data = np.minimum(incidence.data, 1.0)
+        return cls(books, pd.Index(list(genre_ids), name="Genre"), incidence)
+
+    def book_ids(self, genre: str) -> np.ndarray:
+        """Row ids of the books carrying `genre`."""
+        if genre not in self.genres:
+            return np.empty(0, dtype=np.int64)
+        col = self.genres.get_loc(genre)
+        return self.incidence.indices[self.incidence.indptr[col]:self.incidence.indptr[col + 1]]
+
+    def counts(self) -> pd.Series:
+        """Number of books per genre."""
+        return pd.Series(np.asarray(self.incidence.sum(axis=0)).ravel().astype(np.int64), index=self.genres)
+
+    def average(self, scores: pd.Series) -> pd.DataFrame:
+        """Mean of a per-book score over each genre's books.
+
+        `scores` is indexed by book; books without a score are left out.
+        Returns "mean" and "books" (how many scored books) per genre, only
+        for genres with at least one scored book.
+        """
+        values = scores.reindex(self.books).to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        totals = self.incidence.T @ np.where(present, values, 0.0)
+        books = self.incidence.T @ present.astype(float)
+        has = books > 0
+        return pd.DataFrame(
+            {"mean": totals[has] / books[has], "books": books[has].astype(np.int64)},
+            index=self.genres[has],
+        )
+
+    def coverage(self, membership: pd.DataFrame) -> pd.Series:
+        """Distinct genres covered per column of a Book x <key> 0/1 frame.
+
+        E.g. with the attendance matrix, how many genres each member has read.
+        A book listed more than once (re-read) counts if any of its rows does.
+        """
+        membership = membership.groupby(level=0, sort=False).any()
+        aligned = sparse.csr_matrix(membership.reindex(self.books, fill_value=False).to_numpy(dtype=float).T)
+        reached = aligned @ self.incidence
+        return pd.Series(np.diff((reached > 0).tocsr().indptr), index=membership.columns)
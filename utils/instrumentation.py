@@ -0,0 +1,225 @@
+"""In-process timings and cache statistics for the data and analytics layers.
+
+Enabled with DBC_DIAGNOSTICS=1. When it is on, utils.data_loader and
+utils.calculations wrap their public functions at import time to record call
+counts, cumulative and p95 latency, errors and the size of the last result.
+Functions behind st.cache_data / st.cache_resource mark their cache misses
+with @cache_miss, and lru_cache functions report their own cache_info(), so
+hit rates cover every cache layer. Pages call page() to tag which page the
+calls came from. diagnostics.py renders report(); app.py only lists that
+page when enabled.
+
+All state is process-wide and shared by every session. When disabled, every
+hook is a no-op and nothing is wrapped.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+ENABLED = os.environ.get("DBC_DIAGNOSTICS", "") == "1"
+
+# Latencies kept per function for the percentile estimate
+SAMPLE_SIZE = 1_000
+
+_lock = threading.Lock()
+_local = threading.local()
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=SAMPLE_SIZE))
+    rows: int | None = None
+    nbytes: int | None = None
+
+
+_functions: dict[str, CallStats] = {}
+_misses: dict[str, int] = {}
+_lru: dict[str, object] = {}
+_cache_events: dict[str, list[int]] = {}
+_pages: dict[str, CallStats] = {}
+
+
+def _result_size(result) -> tuple[int | None, int | None]:
+    """(rows, bytes) of a result, without deep memory inspection."""
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(result.memory_usage(index=True).sum())
+    if isinstance(result, pd.Series):
+        return len(result), int(result.memory_usage(index=True))
+    if isinstance(result, np.ndarray):
+        return len(result), result.nbytes
+    if isinstance(result, (list, tuple, dict, set)):
+        return len(result), None
+    return None, None
+
+
+def _record(name: str, seconds: float, outermost: bool, result=None, failed: bool = False) -> None:
+    rows, nbytes = (None, None) if failed else _result_size(result)
+    # Nested calls are already inside their caller's time
+    page = getattr(_local, "page", None) if outermost else None
+    with _lock:
+        stats = _functions.setdefault(name, CallStats())
+        stats.calls += 1
+        stats.errors += failed
+        stats.total += seconds
+        stats.latencies.append(seconds)
+        if rows is not None:
+            stats.rows, stats.nbytes = rows, nbytes
+        if page is not None:
+            page_stats = _pages.setdefault(page, CallStats())
+            page_stats.total += seconds
+            page_stats.latencies.append(seconds)
+
+
+def timed(fn, name: str):
+    """Wrap `fn` so every call is recorded under `name`."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        depth = getattr(_local, "depth", 0)
+        _local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            _record(name, time.perf_counter() - start, depth == 0, failed=True)
+            raise
+        finally:
+            _local.depth = depth
+        _record(name, time.perf_counter() - start, depth == 0, result)
+        return result
+
+    # Keep cache controls reachable through the wrapper
+    for attr in ("clear", "cache_clear", "cache_info"):
+        if hasattr(fn, attr):
+            setattr(wrapper, attr, getattr(fn, attr))
+    if hasattr(fn, "cache_info"):
+        _lru[name] = fn
+    return wrapper
+
+
+def instrument_module(module) -> None:
+    """Replace the public functions defined in `module` with timed wrappers.
+
+    Private helpers behind st.cache_* are wrapped too, so the misses their
+    @cache_miss records have call counts to be measured against. Runs at
+    the end of the module, so other modules importing those names (and the
+    module's own calls through its globals) get the wrappers.
+    """
+    if not ENABLED:
+        return
+    prefix = module.__name__.removeprefix("utils.")
+    for attr, obj in list(vars(module).items()):
+        if isinstance(obj, type) or not callable(obj):
+            continue
+        if attr.startswith("_") and not hasattr(obj, "clear"):
+            continue
+        if getattr(obj, "__module__", None) != module.__name__:
+            continue
+        setattr(module, attr, timed(obj, f"{prefix}.{attr}"))
+
+
+def cache_miss(name: str):
+    """Decorator for the body of an st.cache_* function: counts its misses.
+
+    Apply it below the Streamlit decorator. The body only runs on a miss,
+    so hits are the recorded calls of `name` minus these misses.
+    """
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _lock:
+                _misses[name] = _misses.get(name, 0) + 1
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def cache_event(name: str, hit: bool) -> None:
+    """Count a hit or miss for a cache layer that is not a function memo."""
+    if not ENABLED:
+        return
+    with _lock:
+        counts = _cache_events.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+def page(name: str) -> None:
+    """Attribute the calls of the current script run to page `name`."""
+    if not ENABLED:
+        return
+    _local.page = name
+    with _lock:
+        _pages.setdefault(name, CallStats()).calls += 1
+
+
+def _p95(latencies) -> float:
+    return float(np.percentile(latencies, 95)) if latencies else 0.0
+
+
+def report() -> dict[str, pd.DataFrame]:
+    """Current statistics as "functions", "caches" and "pages" frames."""
+    with _lock:
+        functions = [
+            {
+                "Function": name,
+                "Calls": s.calls,
+                "Errors": s.errors,
+                "Total (ms)": s.total * 1000,
+                "Mean (ms)": s.total / s.calls * 1000 if s.calls else 0.0,
+                "p95 (ms)": _p95(s.latencies) * 1000,
+                "Last Rows": s.rows,
+                "Last Size (KB)": s.nbytes / 1024 if s.nbytes is not None else None,
+            }
+            for name, s in _functions.items()
+        ]
+        caches = [
+            {"Cache": name, "Hits": _functions[name].calls - misses, "Misses": misses}
+            for name, misses in _misses.items()
+            if name in _functions
+        ]
+        caches += [{"Cache": name, "Hits": hits, "Misses": misses} for name, (hits, misses) in _cache_events.items()]
+        lru = list(_lru.items())
+        pages = [
+            {
+                "Page": name,
+                "Runs": s.calls,
+                "Data Time (ms)": s.total * 1000,
+                "Per Run (ms)": s.total / s.calls * 1000 if s.calls else 0.0,
+                "Slowest Call (ms)": max(s.latencies, default=0.0) * 1000,
+            }
+            for name, s in _pages.items()
+        ]
+
+    for name, fn in lru:
+        info = fn.cache_info()
+        caches.append({"Cache": name, "Hits": info.hits, "Misses": info.misses})
+
+    caches_df = pd.DataFrame(caches, columns=["Cache", "Hits", "Misses"])
+    lookups = caches_df["Hits"] + caches_df["Misses"]
+    caches_df["Hit Rate"] = (caches_df["Hits"] / lookups.where(lookups > 0)).astype(float)
+    return {
+        "functions": pd.DataFrame(functions).sort_values("Total (ms)", ascending=False) if functions else pd.DataFrame(),
+        "caches": caches_df,
+        "pages": pd.DataFrame(pages).sort_values("Per Run (ms)", ascending=False) if pages else pd.DataFrame(),
+    }
+
+
+def reset() -> None:
+    """Forget every recorded statistic (lru_cache counters are left alone)."""
+    with _lock:
+        _functions.clear()
+        _misses.clear()
+        _cache_events.clear()
+        _pages.clear()
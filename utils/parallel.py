@@ -0,0 +1,41 @@
+"""Seeded batches of resampling work, run in-process or on a process pool.
+
+Work is cut into fixed-size batches, each seeded with its own child of one
+SeedSequence, so results depend only on the seed -- not on how many
+processes ran the batches. Used by utils.bootstrap and utils.correlation.
+"""
+
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Below this many cells of work in total, a pool costs more than it saves
+PARALLEL_CELLS = 50_000_000
+
+
+def split_batches(total: int, batch: int, seed: int) -> list[tuple[int, np.random.SeedSequence]]:
+    """(size, seed) for each batch of `total` draws, `batch` at a time."""
+    sizes = [min(batch, total - lo) for lo in range(0, total, batch)]
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+@functools.lru_cache(maxsize=1)
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn: forking a multi-threaded server process is unsafe
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_batches(fn, tasks: list[tuple], cells: int, workers: int | None = None) -> list:
+    """fn(*task) for every task, in order.
+
+    `cells` is the total amount of work; jobs under PARALLEL_CELLS run in
+    this process. `workers` defaults to the CPU count; 1 never uses a pool.
+    `fn` must be a module-level function so the pool can pickle it.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1 or cells < PARALLEL_CELLS:
+        return [fn(*task) for task in tasks]
+    return list(process_pool(workers).map(fn, *zip(*tasks)))
@@ -0,0 +1,64 @@
+"""Conditional-fetch mirror of a published sheet CSV.
+
+The sheet is downloaded to a local file along with the ETag and
+Last-Modified headers of the response. Later polls send them back as
+If-None-Match / If-Modified-Since, so an unchanged sheet costs a single 304
+round trip, and the local file (and everything cached from it) is reused.
+"""
+
+import json
+from pathlib import Path
+
+import requests
+
+from utils import cache
+
+REQUEST_TIMEOUT = 15  # seconds
+
+
+def _meta_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".json")
+
+
+def _read_meta(dest: Path) -> dict:
+    try:
+        with open(_meta_path(dest)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def sync_sheet(url: str, dest: Path, timeout: float = REQUEST_TIMEOUT) -> bool:
+    """Refresh `dest` from `url`; return True if new content was written.
+
+    If the request fails but an earlier copy exists, that copy is kept and
+    False is returned; without a local copy the error is raised.
+    """
+    meta = _read_meta(dest) if dest.exists() else {}
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        resp = requests.get(url, headers=headers, timeout=timeout)
+        if resp.status_code == 304:
+            return False
+        resp.raise_for_status()
+    except requests.RequestException:
+        if dest.exists():
+            return False
+        raise
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    changed = not dest.exists() or dest.read_bytes() != resp.content
+    if changed:
+        cache.write_atomic(dest, resp.content)
+    new_meta = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    cache.write_atomic(_meta_path(dest), json.dumps(new_meta).encode())
+    return changed
@@ -0,0 +1,101 @@
+"""Cosine similarity between the rows of a dense matrix, plus a top-k index.
+
+Rows are L2-normalized once, so every similarity is a plain dot product
+and the full similarity matrix is a single matrix multiply. For large row
+counts, TopKIndex keeps only each row's k nearest neighbours, computed a
+block of rows at a time, so the full (rows x rows) matrix is never held in
+memory or sorted.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Upper bound on the similarity block built at once, in matrix cells
+BLOCK_CELLS = 4_000_000
+
+
+def normalize_rows(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Unit-length copies of the rows of `x`, and a mask of the non-zero rows."""
+    norms = np.linalg.norm(x, axis=1)
+    valid = norms > 0
+    unit = np.zeros_like(x, dtype=float)
+    unit[valid] = x[valid] / norms[valid, None]
+    return unit, valid
+
+
+def cosine_matrix(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """All-pairs cosine similarity of the rows of `x`, plus the non-zero row mask."""
+    unit, valid = normalize_rows(x)
+    return unit @ unit.T, valid
+
+
+@dataclass(frozen=True)
+class TopKIndex:
+    """The k most similar other rows of every row, best first.
+
+    `neighbors[i]` holds row positions and `scores[i]` their similarities;
+    slots past the number of usable neighbours hold -1 and -inf.
+    """
+
+    neighbors: np.ndarray
+    scores: np.ndarray
+
+    @classmethod
+    def build(cls, x: np.ndarray, k: int) -> "TopKIndex":
+        unit, valid = normalize_rows(x)
+        n_rows = len(unit)
+        k = max(0, min(k, n_rows - 1))
+        neighbors = np.full((n_rows, k), -1, dtype=np.int64)
+        scores = np.full((n_rows, k), -np.inf)
+        if k == 0:
+            return cls(neighbors, scores)
+
+        block = max(1, BLOCK_CELLS // max(n_rows, 1))
+        for start in range(0, n_rows, block):
+            stop = min(start + block, n_rows)
+            sims = unit[start:stop] @ unit.T
+            sims[:, ~valid] = -np.inf
+            sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            sims[~valid[start:stop]] = -np.inf
+
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(sims, top, axis=1)
+            # Best first; equal scores keep row order
+            order = np.lexsort((top, -top_scores), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            top[np.isneginf(top_scores)] = -1
+
+            neighbors[start:stop] = top
+            scores[start:stop] = top_scores
+        return cls(neighbors, scores)
+
+    @property
+    def k(self) -> int:
+        return self.neighbors.shape[1]
+
+    def query(self, row: int, k: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Up to `k` (default all stored) neighbours of `row` and their scores."""
+        found = self.neighbors[row] >= 0
+        neighbors, scores = self.neighbors[row][found], self.scores[row][found]
+        return neighbors[:k], scores[:k]
+
+    def top_pairs(self, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The `n` most similar distinct row pairs (i < j), best first.
+
+        Exact for n <= k: every pair in the global top n is in the top k of
+        both of its rows.
+        """
+        rows = np.repeat(np.arange(len(self.neighbors)), self.k)
+        cols = self.neighbors.ravel()
+        scores = self.scores.ravel()
+        keep = cols >= 0
+        i = np.minimum(rows[keep], cols[keep])
+        j = np.maximum(rows[keep], cols[keep])
+        scores = scores[keep]
+
+        _, first = np.unique(i * len(self.neighbors) + j, return_index=True)
+        i, j, scores = i[first], j[first], scores[first]
+        order = np.lexsort((j, i, -scores))[:n]
+        return i[order], j[order], scores[order]
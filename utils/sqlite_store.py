@@ -0,0 +1,142 @@
+"""SQLite-backed ratings store with indexed per-book and per-member queries.
+
+The database mirrors one DataSnapshot: books, members and ratings tables,
+with ratings keyed by (book, member) and a second index on (member, book),
+so looking up one book or one member touches only the matching rows. A book
+row is one sheet row (one meeting), so a re-read title has two. It is
+rebuilt whenever the snapshot version changes.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from utils import cache
+
+DB_PATH = cache.CACHE_DIR / "ratings.sqlite"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE books (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    proposer TEXT,
+    book_index INTEGER NOT NULL
+);
+CREATE TABLE members (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE ratings (
+    book_id INTEGER NOT NULL REFERENCES books(id),
+    member_id INTEGER NOT NULL REFERENCES members(id),
+    likeability REAL NOT NULL,
+    importance REAL NOT NULL,
+    PRIMARY KEY (book_id, member_id)
+) WITHOUT ROWID;
+CREATE INDEX books_by_name ON books(name);
+CREATE INDEX ratings_by_member ON ratings(member_id, book_id);
+"""
+
+RATINGS_QUERY = """
+SELECT b.name AS Book, b.date AS Date, b.proposer AS Proposer, b.book_index,
+       m.name AS Member, r.likeability AS Likeability, r.importance AS Importance
+FROM ratings r
+JOIN books b ON b.id = r.book_id
+JOIN members m ON m.id = r.member_id
+WHERE {where}
+ORDER BY b.book_index, m.id
+"""
+
+_lock = threading.Lock()
+_synced_version: str | None = None
+
+
+def _stored_version(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    try:
+        with closing(sqlite3.connect(path)) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def build(path: Path, version: str, raw: pd.DataFrame, ratings: pd.DataFrame, members: list[str]) -> None:
+    """Write a fresh database for one data version to `path`.
+
+    The file is built next to `path` and renamed over it, so readers never
+    see a partial database.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    # Keyed by sheet row, not title: a re-read book is a second meeting
+    book_ids = {int(index): i for i, index in enumerate(raw["book_index"], start=1)}
+    member_ids = {name: i for i, name in enumerate(members, start=1)}
+
+    conn = sqlite3.connect(tmp)
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute("INSERT INTO meta VALUES ('version', ?)", (version,))
+            conn.executemany(
+                "INSERT INTO books VALUES (?, ?, ?, ?, ?)",
+                zip(
+                    book_ids.values(),
+                    raw["Book"],
+                    raw["Date"].dt.strftime("%Y-%m-%d"),
+                    raw["Proposer"],
+                    book_ids.keys(),
+                ),
+            )
+            conn.executemany("INSERT INTO members VALUES (?, ?)", [(i, m) for m, i in member_ids.items()])
+            conn.executemany(
+                "INSERT INTO ratings VALUES (?, ?, ?, ?)",
+                zip(
+                    ratings["book_index"].astype(int).map(book_ids).tolist(),
+                    ratings["Member"].map(member_ids).tolist(),
+                    ratings["Likeability"].astype(float).tolist(),
+                    ratings["Importance"].astype(float).tolist(),
+                ),
+            )
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+def sync(snapshot) -> None:
+    """Make sure the database on disk matches `snapshot`."""
+    global _synced_version
+    if _synced_version == snapshot.version:
+        return
+    with _lock:
+        if _synced_version == snapshot.version:
+            return
+        if _stored_version(DB_PATH) != snapshot.version:
+            build(DB_PATH, snapshot.version, snapshot.raw, snapshot.ratings, snapshot.members)
+        _synced_version = snapshot.version
+
+
+def _query(where: str, value: str) -> pd.DataFrame:
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        df = pd.read_sql_query(RATINGS_QUERY.format(where=where), conn, params=(value,))
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def book_ratings(book: str) -> pd.DataFrame:
+    """Long-format ratings for one book, in member order."""
+    return _query("b.name = ?", book)
+
+
+def member_ratings(member: str) -> pd.DataFrame:
+    """Long-format ratings given by one member, in book order."""
+    return _query("m.name = ?", member)
@@ -0,0 +1,79 @@
+"""Dense books x members x metrics ratings tensor.
+
+Axis 0 follows sheet order (book_index - 1), axis 1 the members in header
+order and axis 2 the metrics. A cell is NaN in every metric when the member
+did not rate the book. The array is persisted as a .npy file next to the
+cached frames and memory-mapped read-only, so every worker process shares
+one physical copy through the page cache.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+
+def build_values(like: np.ndarray, imp: np.ndarray) -> np.ndarray:
+    """Stack (books x members) metric blocks into a float64 tensor.
+
+    Sheet ratings include averaged values such as 2.3333 and 3.7, so the
+    tensor keeps full float64 precision to match the long ratings frame.
+    A rating only counts when both metrics are present, matching the long
+    ratings frame, so half-filled cells are blanked in both metrics.
+    """
+    values = np.stack([like, imp], axis=-1).astype(np.float64)
+    values[np.isnan(values).any(axis=-1)] = np.nan
+    return values
+
+
+@dataclass(frozen=True)
+class RatingsTensor:
+    """Ratings tensor plus the name <-> index maps for its axes."""
+
+    values: np.ndarray
+    books: list[str]
+    dates: np.ndarray
+    members: list[str]
+    metrics: tuple[str, ...]
+
+    @cached_property
+    def book_index(self) -> dict[str, int]:
+        return {book: i for i, book in enumerate(self.books)}
+
+    @cached_property
+    def member_index(self) -> dict[str, int]:
+        return {member: i for i, member in enumerate(self.members)}
+
+    @cached_property
+    def mask(self) -> np.ndarray:
+        """Boolean (books x members) array, True where a rating exists."""
+        return ~np.isnan(self.values[..., 0])
+
+    @cached_property
+    def chronological(self) -> np.ndarray:
+        """Book positions sorted by meeting date."""
+        return np.argsort(self.dates, kind="stable")
+
+    def metric(self, metric: str) -> np.ndarray:
+        """(books x members) view of one metric."""
+        return self.values[..., self.metrics.index(metric)]
+
+    def member_book_matrix(self, metric: str) -> pd.DataFrame:
+        """Member x Book frame for a metric.
+
+        Same layout as pivoting the long ratings: members who rated anything,
+        sorted by name, as rows; rated books in date order as columns.
+        """
+        rated = self.mask
+        book_pos = self.chronological[rated.any(axis=1)[self.chronological]]
+        member_pos = np.flatnonzero(rated.any(axis=0))
+        names = np.array(self.members, dtype=object)[member_pos]
+        member_pos = member_pos[np.argsort(names, kind="stable")]
+
+        data = self.metric(metric)[np.ix_(book_pos, member_pos)].T.copy()
+        return pd.DataFrame(
+            data,
+            index=pd.Index([self.members[i] for i in member_pos], name="Member"),
+            columns=pd.Index([self.books[i] for i in book_pos], name="Book"),
+        )
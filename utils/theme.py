@@ -25,8 +25,6 @@ MEMBER_COLORS = {
     "Christian": "#7B2D8E",
 }
 
-MEMBERS = list(MEMBER_COLORS.keys())
-
 # Plotly layout defaults
 PLOTLY_LAYOUT = dict(
     paper_bgcolor="rgba(0,0,0,0)",
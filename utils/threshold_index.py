@@ -0,0 +1,65 @@
+"""Rows of a frame ranked by one score, for threshold and top-N queries.
+
+The frame is sorted once, largest score first. "Every row scoring above t"
+is then a binary search on the sorted scores plus a slice, and each group
+(e.g. each member) keeps the positions of its rows in that same order, so
+its top N -- optionally above a threshold too -- is a slice as well. No
+query touches rows it does not return.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ThresholdIndex:
+    """`frame` sorted by `score` descending, plus per-group row positions.
+
+    `keys` is the negated sorted score, ascending for np.searchsorted.
+    `groups[column][value]` holds the positions in `frame` of the rows whose
+    `column` equals `value`, in ascending order (so best first).
+    """
+
+    frame: pd.DataFrame
+    keys: np.ndarray
+    groups: dict[str, dict[object, np.ndarray]]
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame, score: str, group_by: tuple[str, ...] = ()) -> "ThresholdIndex":
+        ranked = frame.sort_values(score, ascending=False, kind="stable")
+        groups = {}
+        for column in group_by:
+            codes, values = pd.factorize(ranked[column])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            groups[column] = {
+                value: order[bounds[k]:bounds[k + 1]] for k, value in enumerate(values)
+            }
+        return cls(ranked, -ranked[score].to_numpy(dtype=float), groups)
+
+    def _cut(self, positions: np.ndarray, threshold: float | None) -> np.ndarray:
+        """The leading `positions` whose rows score above `threshold`."""
+        if threshold is None:
+            return positions
+        return positions[:np.searchsorted(self.keys[positions], -threshold, side="left")]
+
+    def count_above(self, threshold: float) -> int:
+        """Number of rows scoring strictly above `threshold`."""
+        return int(np.searchsorted(self.keys, -threshold, side="left"))
+
+    def above(self, threshold: float) -> pd.DataFrame:
+        """Rows scoring strictly above `threshold`, best first."""
+        return self.frame.iloc[:self.count_above(threshold)]
+
+    def top(self, n: int, column: str, value, threshold: float | None = None) -> pd.DataFrame:
+        """The `n` best rows whose `column` equals `value`, optionally above `threshold`."""
+        positions = self.groups[column].get(value, np.empty(0, dtype=np.int64))
+        return self.frame.iloc[self._cut(positions, threshold)[:n]]
+
+    def top_per_group(self, n: int, column: str, threshold: float | None = None) -> pd.DataFrame:
+        """The `n` best rows of every `column` group, best first overall."""
+        parts = [self._cut(positions, threshold)[:n] for positions in self.groups[column].values()]
+        positions = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        return self.frame.iloc[positions]
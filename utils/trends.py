@@ -0,0 +1,63 @@
+"""Moving averages over a series of rows, from one set of prefix sums.
+
+Cumulative sums and non-missing counts are taken once; the mean of any
+window [i - w, i) is then a difference of two prefix entries, so a rolling
+mean of any width, or an expanding mean, is O(n) with no per-window work.
+Exponentially weighted means are a first-order recursion, run as a linear
+filter (scipy.signal.lfilter) over the same columns.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import signal
+
+
+@dataclass(frozen=True)
+class PrefixSums:
+    """(rows + 1) x columns cumulative sums and counts, NaN counted as absent."""
+
+    values: np.ndarray
+    sums: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def build(cls, values: np.ndarray) -> "PrefixSums":
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        present = ~np.isnan(values)
+        zero = np.zeros((1, values.shape[1]))
+        sums = np.concatenate([zero, np.cumsum(np.where(present, values, 0.0), axis=0)])
+        counts = np.concatenate([zero, np.cumsum(present, axis=0)])
+        return cls(values, sums, counts)
+
+    def _window_mean(self, start: np.ndarray, min_periods: int) -> np.ndarray:
+        stop = np.arange(1, len(self.sums))
+        total = self.sums[stop] - self.sums[start]
+        count = self.counts[stop] - self.counts[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+        return np.where(count >= max(min_periods, 1), mean, np.nan)
+
+    def rolling(self, window: int, min_periods: int = 1) -> np.ndarray:
+        """Mean of each row and the `window` - 1 before it, as pandas rolling()."""
+        start = np.maximum(np.arange(1, len(self.sums)) - window, 0)
+        return self._window_mean(start, min_periods)
+
+    def expanding(self, min_periods: int = 1) -> np.ndarray:
+        """Mean of each row and every row before it."""
+        return self._window_mean(np.zeros(len(self.sums) - 1, dtype=np.int64), min_periods)
+
+    def ewm(self, span: float) -> np.ndarray:
+        """Exponentially weighted mean with alpha = 2 / (span + 1).
+
+        Matches pandas ewm(span=span).mean() (adjust=True): weights decay
+        with row distance, and missing values only drop out of the weights.
+        """
+        decay = 1 - 2 / (span + 1)
+        present = ~np.isnan(self.values)
+        weighted = signal.lfilter([1.0], [1.0, -decay], np.where(present, self.values, 0.0), axis=0)
+        weights = signal.lfilter([1.0], [1.0, -decay], present.astype(float), axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(weights > 0, weighted / weights, np.nan)